@@ -0,0 +1,125 @@
+import numpy as np
+
+from reward import DAMAGE_TERMS, GROWTH_TERMS, RUE, factor_function, finish_reward
+
+# Column of every action in the MultiDiscrete action of HydroponicEnv.step
+RH, EC, LIGHT_DURATION, LIGHT_INTENSITY, PH, TEMP, WATERING_CYCLES, WATERING_PERIOD = range(8)
+ACTION_NVEC = (61, 51, 49, 41, 51, 51, 11, 49)
+# Config units of an action index, index * scale + offset as decoded by HydroponicEnv.retreive_data
+# (RH %, EC, light_duration hours, light_intensity, PH, temperature °C, water_cycles, water_duration minutes)
+ACTION_SCALE = np.array([1.0, 0.1, 0.5, 500.0, 0.1, 1.0, 1.0, 30.0])
+ACTION_OFFSET = np.array([30.0, 0.0, 0.0, 0.0, 4.0, 10.0, 0.0, 0.0])
+
+
+def decode_actions(actions):
+    # (..., 8) actions in Config units, for plants whose conditions are not in action indices like env_plant's
+    return np.asarray(actions) * ACTION_SCALE + ACTION_OFFSET
+
+
+def growth_inputs(actions):
+    # (..., 7) growth factor inputs in GROWTH_FACTORS order of raw action values like HydroponicEnv, or of
+    # decode_actions values
+    a = np.asarray(actions)
+    ppfd = a[..., LIGHT_INTENSITY] * 0.0185
+    DLI = ppfd * a[..., LIGHT_DURATION] * 3600 / 1000000
+    return np.stack([
+        DLI,
+        a[..., TEMP],
+        a[..., PH],
+        a[..., EC],
+        a[..., RH],
+        a[..., WATERING_PERIOD],
+        a[..., WATERING_CYCLES],
+    ], axis=-1)
+
+
+def damage_conditions(actions):
+    # (..., 7) damage conditions in DAMAGE_FACTORS order
+    a = np.asarray(actions)
+    return np.stack([
+        a[..., LIGHT_INTENSITY],
+        a[..., LIGHT_DURATION],
+        a[..., TEMP],
+        a[..., RH],
+        a[..., PH],
+        a[..., EC],
+        a[..., WATERING_PERIOD] * a[..., WATERING_CYCLES],
+    ], axis=-1)
+
+
+class ActionTables:
+    # Every growth factor and damage term of HydroponicEnv tabulated per stage over every legal action value.
+    # Light growth uses (light_intensity, light_duration) through DLI and TWD damage uses
+    # (watering_period, watering_cycles), every other entry depends on a single action.
+    # A step is then integer gathers plus the products and sums of reward.finish_reward, without exp or **.
+    # With decode the tables are evaluated on the decode_actions values of the action indices.
+    def __init__(self, profile, damage_engine, decode=False):
+        n_stages = profile.growth_optimal.shape[0]
+        stages = np.arange(n_stages)
+        optimal = profile.growth_optimal
+        sigma = profile.growth_sigma
+
+        def values(column):
+            if decode:
+                return np.arange(ACTION_NVEC[column]) * ACTION_SCALE[column] + ACTION_OFFSET[column]
+            return np.arange(ACTION_NVEC[column])
+
+        def growth_table(i, x):
+            # (stage, *x.shape) table of growth factor i
+            shape = (n_stages,) + (1,) * x.ndim
+            return factor_function(optimal[:, i].reshape(shape), x[None], sigma[:, i].reshape(shape))
+
+        def damage_table(i, x):
+            # (stage, *x.shape) table of damage term i
+            conditions = np.repeat(x.reshape(1, -1, 1), optimal.shape[1], axis=2).astype(np.float64)
+            terms = damage_engine.terms(stages[:, None], conditions)
+            return terms[..., i].reshape((n_stages,) + x.shape)
+
+        # Same expression as HydroponicEnv.growth_inputs so DLI rounds identically
+        ppfd = values(LIGHT_INTENSITY)[:, None] * 0.0185
+        DLI = ppfd * values(LIGHT_DURATION)[None, :] * 3600 / 1000000
+        TWD = values(WATERING_PERIOD)[:, None] * values(WATERING_CYCLES)[None, :]
+
+        # Growth factors, in GROWTH_FACTORS order
+        self.f_light = growth_table(0, DLI)
+        self.f_temp = growth_table(1, values(TEMP))
+        self.f_ph = growth_table(2, values(PH))
+        self.f_ec = growth_table(3, values(EC))
+        self.f_rh = growth_table(4, values(RH))
+        self.f_water_duration = growth_table(5, values(WATERING_PERIOD))
+        self.f_n_cycles = growth_table(6, values(WATERING_CYCLES))
+
+        # Damage terms, in DAMAGE_FACTORS order
+        self.d_light_intensity = damage_table(0, values(LIGHT_INTENSITY))
+        self.d_light_duration = damage_table(1, values(LIGHT_DURATION))
+        self.d_temperature = damage_table(2, values(TEMP))
+        self.d_RH = damage_table(3, values(RH))
+        self.d_PH = damage_table(4, values(PH))
+        self.d_EC = damage_table(5, values(EC))
+        self.d_TWD = damage_table(6, TWD)
+
+    def nbytes(self):
+        return sum(table.nbytes for table in vars(self).values())
+
+    def compute_reward(self, stage, rue, actions, out):
+        # Same breakdown as reward.compute_reward for a (..., 8) batch of MultiDiscrete actions
+        a = np.asarray(actions)
+        f = out[..., GROWTH_TERMS]
+        f[..., 0] = self.f_light[stage, a[..., LIGHT_INTENSITY], a[..., LIGHT_DURATION]]
+        f[..., 1] = self.f_temp[stage, a[..., TEMP]]
+        f[..., 2] = self.f_ph[stage, a[..., PH]]
+        f[..., 3] = self.f_ec[stage, a[..., EC]]
+        f[..., 4] = self.f_rh[stage, a[..., RH]]
+        f[..., 5] = self.f_water_duration[stage, a[..., WATERING_PERIOD]]
+        f[..., 6] = self.f_n_cycles[stage, a[..., WATERING_CYCLES]]
+        out[..., RUE] = rue
+
+        d = out[..., DAMAGE_TERMS]
+        d[..., 0] = self.d_light_intensity[stage, a[..., LIGHT_INTENSITY]]
+        d[..., 1] = self.d_light_duration[stage, a[..., LIGHT_DURATION]]
+        d[..., 2] = self.d_temperature[stage, a[..., TEMP]]
+        d[..., 3] = self.d_RH[stage, a[..., RH]]
+        d[..., 4] = self.d_PH[stage, a[..., PH]]
+        d[..., 5] = self.d_EC[stage, a[..., EC]]
+        d[..., 6] = self.d_TWD[stage, a[..., WATERING_PERIOD], a[..., WATERING_CYCLES]]
+        return finish_reward(out)
@@ -0,0 +1,43 @@
+import numpy as np
+
+LOW, HIGH = 0, 1
+
+
+class DamageEngine:
+    # Piecewise power-law damage of every factor in plant_profile.DAMAGE_FACTORS, evaluated in one array pass.
+    # Thresholds are (stage, factor, low/high) arrays taken from a PlantProfile.
+    def __init__(self, profile):
+        self.optimal = profile.damage_optimal
+        params = np.stack([profile.low_parameters, profile.high_parameters], axis=2)
+        self.critical = params[..., 0]
+        self.span = params[..., 1] - params[..., 0]
+        self.gamma = params[..., 2]
+
+    def terms(self, stage, conditions):
+        # conditions is (..., factor) in DAMAGE_FACTORS order, stage is a scalar or broadcasts against conditions[..., 0]
+        conditions = np.asarray(conditions, dtype=np.float64)
+        stage = np.asarray(stage)
+        optimal = self.optimal[stage]
+        critical = self.critical[stage]
+
+        is_low = (conditions < optimal) & (conditions < critical[..., LOW])
+        is_high = ~is_low & (conditions > optimal) & (conditions > critical[..., HIGH])
+        x_critical = np.where(is_high, critical[..., HIGH], critical[..., LOW])
+        span = np.where(is_high, self.span[stage][..., HIGH], self.span[stage][..., LOW])
+        gamma = np.where(is_high, self.gamma[stage][..., HIGH], self.gamma[stage][..., LOW])
+
+        # Non real powers (nan) count as no damage, like max(0, nan) in the scalar d_t
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            f_x = ((conditions - x_critical) / span) ** gamma
+            f_x = np.where(f_x > 0, f_x, 0.0)
+        return np.where(is_low | is_high, f_x, 0.0)
+
+    def total(self, terms):
+        # Summed factor by factor so the result rounds exactly like the scalar damage_loss
+        total = terms[..., 0]
+        for i in range(1, terms.shape[-1]):
+            total = total + terms[..., i]
+        return total
+
+    def damage_loss(self, stage, conditions):
+        return self.total(self.terms(stage, conditions))
@@ -0,0 +1,33 @@
+import functools
+import os
+
+from gymnasium.vector import AsyncVectorEnv
+
+from gym_env import HydroponicEnv
+
+
+def _make_env(rank, seed, env_kwargs):
+    env = HydroponicEnv(**env_kwargs)
+    if seed is not None:
+        env.reset(seed=seed + rank)
+        env.action_space.seed(seed + rank)
+    return env
+
+
+def make_env_fns(n_envs, seed=None, **env_kwargs):
+    # Picklable constructors, every worker builds its own env so no pygame state crosses a process boundary
+    return [functools.partial(_make_env, rank, seed, env_kwargs) for rank in range(n_envs)]
+
+
+def make_async_vector_env(n_envs=None, seed=None, context=None, **env_kwargs):
+    # gymnasium.vector.AsyncVectorEnv with one HydroponicEnv per worker process, one per core by default
+    n_envs = n_envs or os.cpu_count()
+    return AsyncVectorEnv(make_env_fns(n_envs, seed, **env_kwargs), context=context)
+
+
+def make_subproc_vec_env(n_envs=None, seed=None, start_method=None, **env_kwargs):
+    # stable_baselines3 SubprocVecEnv with one HydroponicEnv per worker process, one per core by default
+    from stable_baselines3.common.vec_env import SubprocVecEnv
+
+    n_envs = n_envs or os.cpu_count()
+    return SubprocVecEnv(make_env_fns(n_envs, seed, **env_kwargs), start_method=start_method)
@@ -0,0 +1,144 @@
+# Plant simulated by HydroponicEnv and HydroponicVectorEnv, same fields as Config/plant_temp.py.
+# The environment uses one set of conditions for every stage, stages only change the observation.
+
+MAX_BIOMASS = 450                          # Maximum biomass in grams
+LIFETIME = 150                             # Maximum life time of the plant in days
+MANUAL_STAGES = True                       # Stages start on days 10, 30, 60 and 90
+NUMBER_OF_DAYS_PER_STAGE = [10, 20, 30, 30, 60]
+
+# Compared against the raw action values of HydroponicEnv, as in HydroponicEnv.calc_growth and d_t.
+# Plants without this flag (every Config/ file) are in Config units, the envs decode their actions first.
+ACTION_INDEX_UNITS = True
+
+OPTIMAL_CONDITIONS = {
+    "light_intensity": [10000, 10000, 10000, 10000, 10000],
+    "light_duration": [10, 10, 10, 10, 10],
+    "DLI": [8, 8, 8, 8, 8],
+    "temperature": [25, 25, 25, 25, 25],
+    "RH": [55, 55, 55, 55, 55],
+    "PH": [6.4, 6.4, 6.4, 6.4, 6.4],
+    "EC": [1.4, 1.4, 1.4, 1.4, 1.4],
+    "water_duration": [1.5, 1.5, 1.5, 1.5, 1.5],
+    "water_cycles": [5, 5, 5, 5, 5]
+}
+
+# Growth parameters
+GROWTH_SIGMAS = {
+    "DLI": [3, 3, 3, 3, 3],
+    "temperature": [8, 8, 8, 8, 8],
+    "RH": [15.8, 15.8, 15.8, 15.8, 15.8],
+    "PH": [0.7, 0.7, 0.7, 0.7, 0.7],
+    "EC": [0.8, 0.8, 0.8, 0.8, 0.8],
+    "water_duration": [0.8, 0.8, 0.8, 0.8, 0.8],
+    "water_cycles": [1.5, 1.5, 1.5, 1.5, 1.5]
+}
+
+K = 70      # Parameter to tune the growth curve  (peak day)
+A = 20      # Parameter to tune the growth curve  (controls the spread)
+
+# Damage parameters
+DAMAGE_SENSITIVITY = 0.1
+
+LOW_PARAMETERS = {
+    "light_intensity": [
+        [3000, -500, 3],        #[Critical low, minimum, sigma]
+        [3000, -500, 3],
+        [3000, -500, 3],
+        [3000, -500, 3],
+        [3000, -500, 3],
+    ],
+    "light_duration": [
+        [5, -1, 6.4],
+        [5, -1, 6.4],
+        [5, -1, 6.4],
+        [5, -1, 6.4],
+        [5, -1, 6.4],
+    ],
+    "temperature": [
+        [7, -1, 3.3],
+        [7, -1, 3.3],
+        [7, -1, 3.3],
+        [7, -1, 3.3],
+        [7, -1, 3.3],
+    ],
+    "RH": [
+        [200, 400, 1],
+        [200, 400, 1],
+        [200, 400, 1],
+        [200, 400, 1],
+        [200, 400, 1],
+    ],
+    "PH": [
+        [4.4, 1.8, 2.0],
+        [4.4, 1.8, 2.0],
+        [4.4, 1.8, 2.0],
+        [4.4, 1.8, 2.0],
+        [4.4, 1.8, 2.0],
+    ],
+    "EC": [
+        [0, 0, 2],
+        [0, 0, 2],
+        [0, 0, 2],
+        [0, 0, 2],
+        [0, 0, 2],
+    ],
+    "TWD": [
+        [5, -5, 2.0],
+        [5, -5, 2.0],
+        [5, -5, 2.0],
+        [5, -5, 2.0],
+        [5, -5, 2.0],
+    ],
+}
+
+HIGH_PARAMETERS = {
+    "light_intensity": [
+        [65000, 100000, 5.2],        #[Critical high, maximum, sigma]
+        [65000, 100000, 5.2],
+        [65000, 100000, 5.2],
+        [65000, 100000, 5.2],
+        [65000, 100000, 5.2],
+    ],
+    "light_duration": [
+        [14, 30, 2.3],
+        [14, 30, 2.3],
+        [14, 30, 2.3],
+        [14, 30, 2.3],
+        [14, 30, 2.3],
+    ],
+    "temperature": [
+        [40, 54, 3.3],
+        [40, 54, 3.3],
+        [40, 54, 3.3],
+        [40, 54, 3.3],
+        [40, 54, 3.3],
+    ],
+    "RH": [
+        [200, 400, 1],
+        [200, 400, 1],
+        [200, 400, 1],
+        [200, 400, 1],
+        [200, 400, 1],
+    ],
+    "PH": [
+        [8.2, 10, 2.2],
+        [8.2, 10, 2.2],
+        [8.2, 10, 2.2],
+        [8.2, 10, 2.2],
+        [8.2, 10, 2.2],
+    ],
+    "EC": [
+        [12, 12, 2],
+        [12, 12, 2],
+        [12, 12, 2],
+        [12, 12, 2],
+        [12, 12, 2],
+    ],
+    "TWD": [
+        [12, 30, 2],
+        [12, 30, 2],
+        [12, 30, 2],
+        [12, 30, 2],
+        [12, 30, 2],
+    ],
+}
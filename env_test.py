@@ -1,18 +1,12 @@
-from gymnasium.envs.registration import register
-from gym_env import HydroponicEnv
-
-register(
-    id='HydroponicEnv-v0',
-    entry_point='gym_env:HydroponicEnv',
-)
+import hydroponic_envs  # registers HydroponicEnv-v0
 
 import gymnasium as gym
 
-env = gym.make('HydroponicEnv-v0')
+env = gym.make('HydroponicEnv-v0', render_mode="human")
 obs, _ = env.reset()
 
 action = env.action_space.sample()
 obs, reward, done, truncated, info = env.step(action)
 while True:
     import time
-    time.sleep(0.1)
\ No newline at end of file
+    time.sleep(0.1)
@@ -0,0 +1,161 @@
+import numpy as np
+
+from damage import DamageEngine
+from plant_config import plant_digest
+from plant_profile import DAMAGE_FACTORS, GROWTH_FACTORS, PlantProfile, load_plant
+from reward import DAMAGE, GROWTH, REWARD_FIELDS, RUE, compute_reward, finish_reward
+from rollout import biomass_scan
+
+
+def stack_conditions(condition_sets):
+    # One conditions dict of (batch, stage) arrays from a sequence of OPTIMAL_CONDITIONS-like dicts
+    return {name: np.array([conditions[name] for conditions in condition_sets], dtype=np.float64)
+            for name in condition_sets[0]}
+
+
+def stage_inputs(conditions):
+    # (..., stage, 7) growth inputs and damage conditions of a conditions dict like OPTIMAL_CONDITIONS,
+    # every value is a per stage list or a (batch, stage) array
+    c = {name: np.asarray(values, dtype=np.float64) for name, values in conditions.items()}
+    ppfd = c["light_intensity"] * 0.0185
+    c["DLI"] = ppfd * c["light_duration"] * 3600 / 1000000
+    c["TWD"] = c["water_duration"] * c["water_cycles"]
+    return (np.stack([c[name] for name in GROWTH_FACTORS], axis=-1),
+            np.stack([c[name] for name in DAMAGE_FACTORS], axis=-1))
+
+
+class GrowthModel:
+    # Daily biomass model of Simulator.py with all state on the instance: no pygame, no prints, no module globals.
+    # plant is a Config module or the file name of one in config_folder. conditions defaults to OPTIMAL_CONDITIONS.
+    # step() appends every day to recorder (a recorder.TrajectoryRecorder) when one is given and looks the
+    # stage's factors and damage terms up in cache (a memo.EvaluationCache, shareable between models) if set.
+    def __init__(self, plant, num_stages=5, conditions=None, config_folder='Config', recorder=None, cache=None):
+        plant = load_plant(plant, config_folder)
+        self.species = plant.__name__
+        # Identifies the plant's settings in cache, two configs of one name or an edited config don't share entries
+        self.cache_key = (self.species, num_stages, plant_digest(plant)) if cache is not None else None
+        self.profile = PlantProfile(plant, num_stages)
+        self.damage_engine = DamageEngine(self.profile)
+        self.lifetime = self.profile.lifetime
+        self.damage_sensitivity = self.profile.damage_sensitivity
+        self.breakdown = np.zeros(len(REWARD_FIELDS))
+        self.recorder = recorder
+        self.cache = cache
+        self.set_conditions(plant.OPTIMAL_CONDITIONS if conditions is None else conditions)
+        self.reset()
+
+    def set_conditions(self, conditions):
+        self.conditions = {name: list(values) for name, values in conditions.items()}
+        self.growth_inputs, self.damage_conditions = stage_inputs(self.conditions)
+        # lifetime_curve() checkpoints: biomass at the start of every stage, valid up to stage valid_stages
+        stage_ends = np.cumsum(self.profile.stage_durations)
+        self.stage_starts = np.concatenate([[0], stage_ends[:-1]])
+        self.stage_ends = stage_ends
+        self.stage_biomass = np.zeros(self.profile.num_stages + 1)
+        self.curve = np.empty(self.lifetime)
+        self.valid_stages = 0
+
+    def edit_stage(self, stage, conditions):
+        # Changes some conditions of one stage, e.g. edit_stage(2, {"EC": 3.5}). Checkpoints before the stage stay.
+        for name, value in conditions.items():
+            self.conditions[name][stage] = value
+        growth_inputs, damage_conditions = stage_inputs({name: values[stage]
+                                                         for name, values in self.conditions.items()})
+        self.growth_inputs[stage] = growth_inputs
+        self.damage_conditions[stage] = damage_conditions
+        self.valid_stages = min(self.valid_stages, stage)
+
+    def lifetime_curve(self):
+        # Daily biomass curve like run_lifetime, only the stages from the first edited one are recomputed,
+        # each from the biomass checkpoint at its start. The returned array is reused, copy it to keep it.
+        for stage in range(self.valid_stages, self.profile.num_stages):
+            start, end = self.stage_starts[stage], self.stage_ends[stage]
+            if end > start:
+                compute_reward(self.profile, self.damage_engine, stage, 1.0, self.growth_inputs[stage],
+                               self.damage_conditions[stage], out=self.breakdown)
+                growth = self.breakdown[GROWTH] * self.profile.rue[start:end]
+                retained = np.full(end - start, 1 - self.damage_sensitivity * self.breakdown[DAMAGE])
+                self.curve[start:end] = biomass_scan(growth, retained, self.stage_biomass[stage])
+                self.stage_biomass[stage + 1] = self.curve[end - 1]
+            else:
+                self.stage_biomass[stage + 1] = self.stage_biomass[stage]
+        self.valid_stages = self.profile.num_stages
+        return self.curve
+
+    def reset(self):
+        self.day = 0
+        self.stage = 0
+        self.biomass = 0.0
+
+    def step(self):
+        # Advances one day, returns that day's (growth, damage)
+        self.stage = self.profile.stage_at(self.day)
+        if self.cache is not None:
+            self.breakdown[:] = self.cache.terms(self.cache_key, self.profile, self.damage_engine, self.stage,
+                                                 {name: values[self.stage] for name, values in self.conditions.items()})
+            self.breakdown[RUE] = self.profile.rue_at(self.day)
+            finish_reward(self.breakdown)
+        else:
+            compute_reward(self.profile, self.damage_engine, self.stage, self.profile.rue_at(self.day),
+                           self.growth_inputs[self.stage], self.damage_conditions[self.stage], out=self.breakdown)
+        growth = self.breakdown[GROWTH]
+        damage = self.breakdown[DAMAGE] * self.biomass * self.damage_sensitivity
+        self.day += 1
+        self.biomass += (growth - damage)
+        if self.recorder is not None:
+            self.recorder.record(self.day, self.stage, self.breakdown, self.biomass)
+        return growth, damage
+
+    def run_lifetime(self, conditions=None):
+        # Daily biomass curve (lifetime,) of the model's conditions, or (batch, lifetime) for a conditions dict of
+        # (batch, stage) arrays, without a loop over days and without changing the model state.
+        # Growth does not depend on biomass, so factors and damage are evaluated once per stage and the biomass
+        # recurrence b' = b * (1 - DAMAGE_SENSITIVITY * D) + growth is solved by rollout.biomass_scan.
+        # Equal to stepping the model up to rounding of the biomass sum.
+        if conditions is None:
+            growth_inputs, damage_conditions = self.growth_inputs, self.damage_conditions
+        else:
+            growth_inputs, damage_conditions = stage_inputs(conditions)
+        stages = np.arange(self.profile.num_stages)
+        per_stage = np.empty(growth_inputs.shape[:-2] + (len(stages), len(REWARD_FIELDS)))
+        compute_reward(self.profile, self.damage_engine, stages, 1.0, growth_inputs[..., stages, :],
+                       damage_conditions[..., stages, :], out=per_stage)
+
+        # With RUE = 1 the growth column is the product of the factors, days only scale it by their RUE
+        days = np.arange(self.lifetime)
+        stage = self.profile.stage_for_days(days)
+        growth = per_stage[..., GROWTH][..., stage] * self.profile.rue_for_days(days)
+        retained = 1 - self.damage_sensitivity * per_stage[..., DAMAGE][..., stage]
+        return biomass_scan(growth, retained)
+
+    def run_segments(self, segments):
+        # Lifetime under piecewise constant setpoints, at a cost of O(number of changes) instead of O(days).
+        # segments is [(start_day, conditions), ...] sorted by start_day from day 0, every conditions dict maps each
+        # OPTIMAL_CONDITIONS name to a single value held until the next start_day.
+        # Segments are also cut at stage boundaries. Within a piece the growth factor product P and the retention
+        # a = 1 - DAMAGE_SENSITIVITY * D are constant, so the piece is the map b -> b * a**n + P * sum(RUE * a**k):
+        # without damage (a == 1) the RUE sum comes from profile.rue_prefix, damaged pieces weight their days' RUE
+        # in one array pass. Returns the end day of every piece and the biomass on that day.
+        starts = [start for start, _ in segments]
+        if starts[0] != 0 or any(later <= earlier for earlier, later in zip(starts, starts[1:])):
+            raise ValueError("Segments must start at day 0 and be sorted by strictly increasing start_day.")
+        stage_starts = np.cumsum([0] + self.profile.stage_durations[:-1])
+        cuts = np.union1d(starts, stage_starts)
+        cuts = cuts[cuts < self.lifetime]
+        ends = np.append(cuts[1:], self.lifetime)
+
+        segment = np.searchsorted(starts, cuts, side="right") - 1
+        conditions = {name: np.array([segments[i][1][name] for i in segment], dtype=np.float64)
+                      for name in segments[0][1]}
+        growth_inputs, damage_conditions = stage_inputs(conditions)
+        per_piece = np.empty((len(cuts), len(REWARD_FIELDS)))
+        compute_reward(self.profile, self.damage_engine, self.profile.stage_for_days(cuts), 1.0, growth_inputs,
+                       damage_conditions, out=per_piece)
+
+        growth_factor = per_piece[:, GROWTH]
+        retained = 1 - self.damage_sensitivity * per_piece[:, DAMAGE]
+        growth = growth_factor * (self.profile.rue_prefix[ends] - self.profile.rue_prefix[cuts])
+        for i in np.flatnonzero(retained != 1):
+            days = np.arange(cuts[i], ends[i])
+            growth[i] = growth_factor[i] * np.sum(self.profile.rue[days] * retained[i] ** (ends[i] - 1 - days))
+        return ends, biomass_scan(growth, retained ** (ends - cuts))
@@ -1,59 +1,90 @@
 import gymnasium as gym
-from gymnasium import spaces
 import numpy as np
 import os
-import pygame
-import math
+from typing import NamedTuple
+
+import env_plant
+import rollout
+from action_tables import ActionTables, damage_conditions, decode_actions, growth_inputs
+from damage import DamageEngine
+from observation import OBSERVATION_KEYS, flatten_observation, observation_buffer, observation_space
+from plant_profile import PlantProfile, load_plant
+from reward import REWARD, REWARD_FIELDS, compute_reward
+
+# Created by _init_render, dropped when the env is pickled
+RENDER_ATTRIBUTES = ("screen", "clock", "font", "background", "progress_bar_full", "plant_stages_assets",
+                     "plant_dead_asset")
+
+# Physical values decoded by retreive_data
+DECODED_ATTRIBUTES = ("watering_cycles", "watering_period", "temp", "RH", "light_intensity", "light_duration", "ec",
+                      "ph")
+
+
+class EnvSnapshot(NamedTuple):
+    day: int
+    current_step: int
+    plant_stage: int
+    plant_died: bool
+    done: bool
+    biomass: float
+    height: float
+    state: tuple        # self.state values in OBSERVATION_KEYS order
+    decoded: tuple      # DECODED_ATTRIBUTES, None before the first step
+    last_action: tuple  # None before the first step
+
 
 class HydroponicEnv(gym.Env):
-    def __init__(self):
+    metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 60}
+
+    def __init__(self, render_mode=None, lookup_tables=False, observation_mode="dict", plant_config=None,
+                 episode_length=1000, action_repeat=1, recorder=None):
         super(HydroponicEnv, self).__init__()
 
         # Observation space
-        self.observation_space = spaces.Dict({
-            "plant_stage": spaces.Discrete(5),   
-            "day":  spaces.Discrete(365),
-            "watering_cycles": spaces.Discrete(11), 
-            "watering_period": spaces.Discrete(49),  
-            "temp": spaces.Discrete(51),
-            "RH": spaces.Discrete(61),
-            "light_intensity": spaces.Discrete(41),
-            "light_duration": spaces.Discrete(49),
-            "ec": spaces.Discrete(51),
-            "ph": spaces.Discrete(51)
-        })
+        self.observation_mode = observation_mode
+        self.observation_space = observation_space(observation_mode, episode_length)
+        # flat modes write into this reused buffer, copy it to keep an observation past the next step
+        self.observation_buffer = observation_buffer(observation_mode)
 
         # Action space
         self.action_space = gym.spaces.MultiDiscrete([61, 51, 49, 41, 51, 51, 11, 49])
 
         self.state = None
-        self.episode_length = 1000
+        self.episode_length = episode_length
+        # Days every step() holds its action for, the reward is the sum of the daily rewards
+        self.action_repeat = action_repeat
         self.current_step = 0
-        self.max_days = 150
+        # plant_config is a Config module or the file name of one in Config/, env_plant by default.
+        # Config plants are in physical units, actions are decoded to them (action_tables.decode_actions)
+        plant = env_plant if plant_config is None else load_plant(plant_config)
+        self.decode = not getattr(plant, "ACTION_INDEX_UNITS", False)
+        self.profile = PlantProfile(plant, horizon=self.episode_length + 1)
+        self.damage_engine = DamageEngine(self.profile)
+        # Precomputed per stage factor and damage tables, steps become integer gathers
+        self.action_tables = (ActionTables(self.profile, self.damage_engine, self.decode) if lookup_tables
+                              else None)
+        # Scratch breakdown of the current step (columns are reward.REWARD_FIELDS), info gets a copy
+        self.reward_breakdown = np.zeros(len(REWARD_FIELDS))
+        # recorder.TrajectoryRecorder receiving one row per simulated day, None records nothing
+        self.recorder = recorder
+        self.max_days = self.profile.lifetime
         self.height = 0
         self.biomass = 0
-        self.max_biomass = 450 
-        self.K = 70
-        self.A = 20
-        #pygame init 
-        pygame.init()
-        self.screen = pygame.display.set_mode((1440, 900))
-        self.clock = pygame.time.Clock()
+        self.max_biomass = self.profile.max_biomass
+        self.K = self.profile.K
+        self.A = self.profile.A
+
+        assert render_mode is None or render_mode in self.metadata["render_modes"]
+        self.render_mode = render_mode
+
+        #pygame (imported and created on the first frame, nothing is loaded for render_mode=None)
+        self.screen = None
+        self.clock = None
         self.running = True
         self.dt = 0
         self.font_path = os.path.join('assets', 'Lucida_Handwriting_Italic.ttf')
-        self.font = pygame.font.Font(self.font_path, 32)
         self.x_space = 310
         self.y_space = 83
-        self.mid_position = pygame.Vector2(self.screen.get_width() / 2, self.screen.get_height() / 2)
-        self.background = pygame.image.load(os.path.join("assets", "background.png")).convert()
-        self.progress_bar_full = pygame.image.load(os.path.join("assets", "progress_bar_full.png")).convert()
-        self.plant_stages_assets = [pygame.image.load(os.path.join("assets", "stage-1.png")).convert(),
-                             pygame.image.load(os.path.join("assets", "stage-2.png")).convert(),
-                             pygame.image.load(os.path.join("assets", "stage-3.png")).convert(),
-                             pygame.image.load(os.path.join("assets", "stage-4.png")).convert(),
-                             pygame.image.load(os.path.join("assets", "stage-5.png")).convert()]
-        self.plant_dead_asset = pygame.image.load(os.path.join("assets", "dead.png")).convert()
         self.GREEN = (44, 149, 65)
         self.PURPLE = (143,125,183)
         # Rectangle properties
@@ -62,9 +93,41 @@ class HydroponicEnv(gym.Env):
         self.current_height = 0  
         self.fixed_bottom = 670 
         self.rect_x = 1357
+        self.last_action_dict = None
+
+    def _init_render(self):
+        import pygame
+        if self.render_mode == "human":
+            pygame.init()
+            self.screen = pygame.display.set_mode((1440, 900))
+            self.clock = pygame.time.Clock()
+        else:
+            # rgb_array draws on an off-screen surface, no window is opened
+            pygame.font.init()
+            self.screen = pygame.Surface((1440, 900))
+        self.font = pygame.font.Font(self.font_path, 32)
+        self.mid_position = pygame.Vector2(self.screen.get_width() / 2, self.screen.get_height() / 2)
+        self.background = self._load_asset("background.png")
+        self.progress_bar_full = self._load_asset("progress_bar_full.png")
+        self.plant_stages_assets = [self._load_asset("stage-1.png"),
+                             self._load_asset("stage-2.png"),
+                             self._load_asset("stage-3.png"),
+                             self._load_asset("stage-4.png"),
+                             self._load_asset("stage-5.png")]
+        self.plant_dead_asset = self._load_asset("dead.png")
+
+    def _load_asset(self, file_name):
+        import pygame
+        image = pygame.image.load(os.path.join("assets", file_name))
+        # convert() needs a display surface, off-screen surfaces blit the raw image
+        if pygame.display.get_surface() is not None:
+            image = image.convert()
+        return image
 
     def reset(self, seed=None, options=None):
         self.day=0
+        self.plant_stage = 0
+        self.last_action_dict = None
         self.Done = False
         self.plant_died = False
         super().reset(seed=seed)
@@ -81,7 +144,7 @@ class HydroponicEnv(gym.Env):
             "ph": 0                # min=0 (Discrete(51): 0-50 → maps to 5.0
         }
         self.current_step = 0
-        return self.state, {}
+        return self._observation(), {}
 
     def retreive_data(self):
         
@@ -126,12 +189,25 @@ class HydroponicEnv(gym.Env):
           'ph': int((self.ph - 4.0) * 10)
     }
 
+    def _observation(self):
+        if self.observation_mode == "dict":
+            return self.state
+        return flatten_observation(self.state, self.observation_mode, self.observation_buffer, self.episode_length)
+
     def calculate_stage(self):
-        if self.day < 10: return 0
-        elif 10 <= self.day < 30: return 1
-        elif 30 <= self.day < 60: return 2
-        elif 60 <= self.day < 90: return 3
-        else: return 4
+        return self.profile.stage_at(self.day)
+
+    def _action_dict(self, action):
+        return {
+            "watering_cycles": action[6], 
+            "watering_period": action[7],  
+            "temp": action[5],
+            "RH": action[0],
+            "light_intensity": action[3],
+            "light_duration": action[2],
+            "ec": action[1],
+            "ph": action[4]
+        }
 
     def _apply_actions(self, action):
       self.state['watering_cycles'] = action['watering_cycles']
@@ -143,168 +219,67 @@ class HydroponicEnv(gym.Env):
       self.state['ec'] = action['ec']
       self.state['ph'] = action['ph']
 
-    def calc_growth (self) : 
-        growth = 0 # initial growth 
-
-        #constants optimal 
-        dli_optimal =8
-        tempreture_optimal = 25 
-        ph_optimal = 6.4
-        ec_optimal = 1.4
-        rh_optimal = 55
-        water_duration_optimal = 1.5 # 1.5hr
-        n_cycles_optimal = 5
-
-
-        # constants sigma 
-        dli_sigma = 3
-        tempreture_sigma =8
-        ph_sigma = 0.7
-        ec_sigma = 0.8
-        rh_sigma = 15.8
-        water_duration_sigma =0.8 
-        n_cycles_sigma =  1.5
+    def _state_action(self):
+        # The applied action back in MultiDiscrete column order
+        return (self.state['RH'], self.state['ec'], self.state['light_duration'], self.state['light_intensity'],
+                self.state['ph'], self.state['temp'], self.state['watering_cycles'], self.state['watering_period'])
 
+    def growth_inputs(self):
+        # growth factor inputs in plant_profile.GROWTH_FACTORS order
+        if self.decode:
+            return growth_inputs(decode_actions(self._state_action()))
         #light 
         ppfd = self.state['light_intensity']*0.0185
         DLI = ppfd*self.state['light_duration']*3600/1000000
+        return (DLI, self.state['temp'], self.state['ph'], self.state['ec'], self.state['RH'],
+                self.state['watering_period'], self.state['watering_cycles'])
 
-        f_light = self.factor_function(dli_optimal,DLI,dli_sigma)
-
-        # tempreture 
-        f_temp = self.factor_function(tempreture_optimal ,self.state['temp'] , tempreture_sigma)
-        
-        #ph 
-        f_ph = self.factor_function(ph_optimal , self.state['ph'], ph_sigma)
-
-        #ec
-        f_ec = self.factor_function(ec_optimal , self.state['ec'] , ec_sigma)
-
-        # rh 
-        f_rh = self.factor_function(rh_optimal , self.state['RH'] , rh_sigma)
-
-        #water 
-        f_water_duration = self.factor_function(water_duration_optimal ,self.state['watering_period'] , water_duration_sigma)
-        f_n_cycles = self.factor_function (n_cycles_optimal , self.state['watering_cycles'] , n_cycles_sigma)
-        RUE = self.calculate_RUE()
-        growth = RUE * f_light * f_temp * f_ph * f_ec * f_rh * f_water_duration * f_n_cycles  
-        return growth
-    
     def calculate_RUE(self):
-      RUE_max = self.calc_RUE_max(self.max_biomass,self.K,self.A,self.max_days)
-      return RUE_max * math.exp(-((self.current_step - self.K) ** 2) / (2 * self.A ** 2))
-
-    def calc_RUE_max(self,max_biomass, k, a, n):
-        denominator = sum(math.exp(-((x - k) ** 2) / (2 * a ** 2)) for x in range(n + 1))
-        rue_max = max_biomass / denominator
-        return rue_max
-
-    def factor_function (self,x_optimal , x , sigma_x): 
-        return np.exp(-((x-x_optimal)**2)/(2*(sigma_x)**2))
-    
-    def damage_loss (self,decay_coff=0,biomass=0): 
-        D_t = (self.d_t(self.state['light_intensity'],"light_I")+ self.d_t(self.state['light_duration'],"light_D")+ self.d_t(self.state['temp'],"temp")+
-                  self.d_t(self.state['RH'],"humidity")
-                +self.d_t(self.state['ph'],"ph")+ self.d_t(self.state['ec'],"ec")+ self.d_t(self.state['watering_period']*self.state['watering_cycles'],"TWD"))
-
-        print(type(D_t))
-        return D_t
-
-    def d_t(self,condition,condition_name:str):
-        conditions_factors={
-        # light indensity
-        "light_I":{
-        "light_I_optimal": 10000,
-        "light_I_low" : [3000, -500,3] ,
-        "light_I_high" : [65000,100000,5.2]},
-
-        # light duration
-        "light_D":{
-        "light_D_optimal": 10,
-        "light_D_low" : [5,-1,6.4] ,
-        "light_D_high" : [14,30,2.3]},
-
-        # temp
-        "temp":{
-        "temp_optimal": 25,
-        "temp_low" : [7,-1,3.3] ,
-        "temp_high" : [40,54,3.3]},
-        
-        # humidity
-        "humidity":{
-        "humidity_optimal": 55,
-        "humidity_low" : [200,400,1] ,
-        "humidity_high" : [200,400,1]},
-
-        # ph
-        "ph":{
-        "ph_optimal": 6.4,
-        "ph_low" : [4.4,1.8,2.0] ,
-        "ph_high" : [8.2,10,2.2]},
-
-        # ec
-        "ec":{
-        "ec_optimal": 1.4,
-        "ec_low" : [0,0,2] ,
-        "ec_high" : [12,12,2]},
-
-        # total water duration (number of water cycels * hours per one cycle )
-        "TWD":{
-        "TWD_optimal": 7.5,
-        "TWD_low" : [5,-5,2.0] ,
-        "TWD_high" : [12,30,2]}
+      return self.profile.rue_at(self.current_step)
 
-        }
-        flag = 0
-        if condition < conditions_factors[condition_name][condition_name+"_optimal"] and condition < conditions_factors[condition_name][condition_name+"_low"][0] : 
-            x_critical = conditions_factors[condition_name][condition_name+"_low"][0]
-            x_max = conditions_factors[condition_name][condition_name+"_low"][1]
-            gamma = conditions_factors[condition_name][condition_name+"_low"][2]
-            flag = 1
-            # print(condition_name, {x_critical})
-        elif condition > conditions_factors[condition_name][condition_name+"_optimal"] and condition > conditions_factors[condition_name][condition_name+"_high"][0]:
-            x_critical=conditions_factors[condition_name][condition_name+"_high"][0]
-            x_max = conditions_factors[condition_name][condition_name+"_high"][1]
-            gamma = conditions_factors[condition_name][condition_name+"_high"][2]
-            flag = 1
-
-            
-        if flag== 1: 
-            f_x = max(0,((condition - x_critical) / (x_max - x_critical)) ** gamma)
-        else : 
-            f_x =0
-
-        return f_x 
+    def damage_conditions(self):
+        # damage factors in plant_profile.DAMAGE_FACTORS order
+        if self.decode:
+            return damage_conditions(decode_actions(self._state_action()))
+        return (self.state['light_intensity'], self.state['light_duration'], self.state['temp'], self.state['RH'],
+                self.state['ph'], self.state['ec'], self.state['watering_period']*self.state['watering_cycles'])
 
     def calculate_reward(self):
-        #El model Hykoon hena 
-        # calculate_growth_rate()
-        # calculate_penality()
-        # calculate_height()
-        # reward logic
-        if self.damage_loss():
-            return self.calc_growth() - (self.damage_loss() * self.calc_growth())
-        else:
-            return self.calc_growth()
-
-
+        # growth, damage and reward are evaluated once per step, the breakdown is returned in info
+        if self.action_tables is not None:
+            self.action_tables.compute_reward(self.plant_stage, self.calculate_RUE(), self._state_action(),
+                                              out=self.reward_breakdown)
+            return self.reward_breakdown[REWARD]
+        compute_reward(self.profile, self.damage_engine, self.plant_stage, self.calculate_RUE(),
+                       self.growth_inputs(), self.damage_conditions(), out=self.reward_breakdown)
+        return self.reward_breakdown[REWARD]
+
+    def calculate_repeat_reward(self, action, n_days):
+        # n_days of action in one pass, info["reward_breakdown"] is the breakdown of the last day
+        days = rollout.hold_action(self.profile, self.damage_engine, action, self.current_step - n_days, n_days,
+                                   self.action_tables, decode=self.decode)
+        self.reward_breakdown[:] = days["reward_breakdown"][-1]
+        if self.recorder is not None:
+            day_numbers = np.arange(self.day - n_days + 1, self.day + 1)
+            self.recorder.record_rows(day_numbers, self.profile.stage_for_days(day_numbers), days["reward_breakdown"],
+                                      np.full(n_days, self.biomass))
+        return np.cumsum(days["reward"])[-1]
 
     def step(self, action):
-        self.current_step += 1
-        action_dict = {
-            "watering_cycles": action[6], 
-            "watering_period": action[7],  
-            "temp": action[5],
-            "RH": action[0],
-            "light_intensity": action[3],
-            "light_duration": action[2],
-            "ec": action[1],
-            "ph": action[4]
-        }
+        # The last step of an episode is cut to the days left before episode_length
+        n_days = max(min(self.action_repeat, self.episode_length - self.current_step), 1)
+        self.current_step += n_days
+        action_dict = self._action_dict(action)
 
         self._apply_actions(action_dict)
+        self.day += n_days - 1
         self.retreive_data()
-        self.reward = self.calculate_reward()
+        if n_days == 1:
+            self.reward = self.calculate_reward()
+            if self.recorder is not None:
+                self.recorder.record(self.day, self.plant_stage, self.reward_breakdown, self.biomass)
+        else:
+            self.reward = self.calculate_repeat_reward(action, n_days)
         self.state = self._get_observation_state()
 
         #implement it inside the calculate reward function
@@ -315,14 +290,53 @@ class HydroponicEnv(gym.Env):
         terminated = self.current_step >= self.episode_length
         truncated = False
         self.last_action = action
+        self.last_action_dict = action_dict
         self.last_reward = self.reward
-        # Apply action to the state (later we can define how it affects plant growth)
-        # For now, we skip state transitions to keep it simple
 
-        #pygame loop
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
+        if self.render_mode == "human":
+            self._render_frame()
+        return self._observation(), self.reward, terminated, truncated, {"reward_breakdown": self.reward_breakdown.copy()}
+
+    def simulate_schedule(self, actions):
+        # Per-day biomass, growth, damage and reward arrays of a (T, 8) or (B, T, 8) action schedule in one call,
+        # as if stepped from reset(). The env itself is not changed.
+        return rollout.simulate_schedule(self.profile, self.damage_engine, actions, self.action_tables, self.decode)
+
+    def clone_state(self):
+        # Immutable snapshot of everything step() reads or writes, restore_state(snapshot) branches from it
+        return EnvSnapshot(
+            self.day, self.current_step, self.plant_stage, self.plant_died, self.Done, self.biomass, self.height,
+            tuple(self.state[key] for key in OBSERVATION_KEYS),
+            tuple(getattr(self, name, None) for name in DECODED_ATTRIBUTES),
+            None if self.last_action_dict is None else tuple(self.last_action),
+        )
+
+    def restore_state(self, snapshot):
+        (self.day, self.current_step, self.plant_stage, self.plant_died, self.Done, self.biomass,
+         self.height) = snapshot[:7]
+        self.state = dict(zip(OBSERVATION_KEYS, snapshot.state))
+        for name, value in zip(DECODED_ATTRIBUTES, snapshot.decoded):
+            setattr(self, name, value)
+        if snapshot.last_action is None:
+            self.last_action_dict = None
+        else:
+            self.last_action = snapshot.last_action
+            self.last_action_dict = self._action_dict(snapshot.last_action)
+
+    def render(self):
+        if self.render_mode is None:
+            return None
+        return self._render_frame()
+
+    def _render_frame(self):
+        import pygame
+        if self.screen is None:
+            self._init_render()
+
+        if self.render_mode == "human":
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
                 
         #Background and plant
         self.screen.blit(self.background, (0,0))
@@ -341,124 +355,148 @@ class HydroponicEnv(gym.Env):
             self.screen.blit(self.progress_bar_full, (1356,250))
 
 
-        #Environment
-        #1 Temp
-        self.temp_ts = self.font.render(f"{self.temp} C", True, self.GREEN)
-        self.temp_tr = self.temp_ts.get_rect()
-        self.temp_tr.center = (pygame.Vector2(250,60))
-        self.screen.blit(self.temp_ts, self.temp_tr)
-
-        #2 RH
-        self.rh_ts = self.font.render(f"{self.RH}%", True, self.GREEN)
-        self.rh_tr = self.rh_ts.get_rect()
-        self.rh_tr.center = (pygame.Vector2(250,60+self.y_space))
-        self.screen.blit(self.rh_ts, self.rh_tr)
-
-        #3 PH
-        self.ph_ts = self.font.render(f"{self.ph}", True, self.GREEN)
-        self.ph_tr = self.ph_ts.get_rect()
-        self.ph_tr.center = (pygame.Vector2(250+self.x_space,60))
-        self.screen.blit(self.ph_ts, self.ph_tr)
-
-        #4 EC
-        self.ec_ts = self.font.render(f"{self.ec}", True, self.GREEN)
-        self.ec_tr = self.ec_ts.get_rect()
-        self.ec_tr.center = (pygame.Vector2(250+self.x_space,60+self.y_space))
-        self.screen.blit(self.ec_ts, self.ec_tr)
-
-        #5 Light Intensity
-        self.light_intensity_ts = self.font.render(f"{self.light_intensity} LUX", True, self.GREEN)
-        self.light_intensity_tr = self.light_intensity_ts.get_rect()
-        self.light_intensity_tr.center = (pygame.Vector2(250+2*self.x_space,60))
-        self.screen.blit(self.light_intensity_ts, self.light_intensity_tr)
-
-        #6 Light duration
-        self.light_duration_ts = self.font.render(f"{self.light_duration} mins", True, self.GREEN)
-        self.light_duration_tr = self.light_duration_ts.get_rect()
-        self.light_duration_tr.center = (pygame.Vector2(250+2*self.x_space,60+self.y_space))
-        self.screen.blit(self.light_duration_ts, self.light_duration_tr)
-
-        #7 Water duration/period
-        self.water_duration_ts = self.font.render(f"{self.watering_period} mins", True, self.GREEN)
-        self.water_duration_tr = self.water_duration_ts.get_rect()
-        self.water_duration_tr.center = (pygame.Vector2(250+3*self.x_space,60))
-        self.screen.blit(self.water_duration_ts, self.water_duration_tr)
-
-        #8 Num of water periods
-        self.water_periods_ts = self.font.render(f"{self.watering_cycles}", True, self.GREEN)
-        self.water_periods_tr = self.water_periods_ts.get_rect()
-        self.water_periods_tr.center = (pygame.Vector2(250+3*self.x_space,60+self.y_space))
-        self.screen.blit(self.water_periods_ts, self.water_periods_tr)
-
-        #9 Day
-        self.day_ts = self.font.render(f"{self.day}", True, self.GREEN)
-        self.day_tr = self.water_periods_ts.get_rect()
-        self.day_tr.center = (pygame.Vector2(725,221))
-        self.screen.blit(self.day_ts, self.day_tr)
-
-        #Actions
-        #1 Temp
-        self.action_temp_ts = self.font.render(f"{action_dict['temp']+10} C", True, self.GREEN)
-        self.action_temp_tr = self.action_temp_ts.get_rect()
-        self.action_temp_tr.center = (pygame.Vector2(250,765))
-        self.screen.blit(self.action_temp_ts, self.action_temp_tr)
-
-        #2 RH
-        self.action_rh_ts = self.font.render(f"{action_dict['RH']+30}%", True, self.GREEN)
-        self.action_rh_tr = self.action_rh_ts.get_rect()
-        self.action_rh_tr.center = (pygame.Vector2(250,765+self.y_space))
-        self.screen.blit(self.action_rh_ts, self.action_rh_tr)
-
-        #3 PH
-        self.action_ph_ts = self.font.render(f"{4.0 + (action_dict['ph'] * 0.1)}", True, self.GREEN)
-        self.action_ph_tr = self.action_ph_ts.get_rect()
-        self.action_ph_tr.center = (pygame.Vector2(250+self.x_space,765))
-        self.screen.blit(self.action_ph_ts, self.action_ph_tr)
-
-        #4 EC
-        self.action_ec_ts = self.font.render(f"{action_dict['ec'] * 0.1}", True, self.GREEN)
-        self.action_ec_tr = self.action_ec_ts.get_rect()
-        self.action_ec_tr.center = (pygame.Vector2(250+self.x_space,765+self.y_space))
-        self.screen.blit(self.action_ec_ts, self.action_ec_tr)
-
-        #5 Light Intensity
-        self.action_light_intensity_ts = self.font.render(f"{action_dict['light_intensity'] * 500}", True, self.GREEN)
-        self.action_light_intensity_tr = self.action_light_intensity_ts.get_rect()
-        self.action_light_intensity_tr.center = (pygame.Vector2(250+2*self.x_space,765))
-        self.screen.blit(self.action_light_intensity_ts, self.action_light_intensity_tr)
-
-        #6 Light duration
-        self.action_light_duration_ts = self.font.render(f"{action_dict['light_duration'] * 30}", True, self.GREEN)
-        self.action_light_duration_tr = self.action_light_duration_ts.get_rect()
-        self.action_light_duration_tr.center = (pygame.Vector2(250+2*self.x_space,765+self.y_space))
-        self.screen.blit(self.action_light_duration_ts, self.action_light_duration_tr)
-
-        #7 Water duration/period
-        self.action_water_duration_ts = self.font.render(f"{30 * action_dict['watering_period'] }", True, self.GREEN)
-        self.action_water_duration_tr = self.action_water_duration_ts.get_rect()
-        self.action_water_duration_tr.center = (pygame.Vector2(250+3*self.x_space,765))
-        self.screen.blit(self.action_water_duration_ts, self.action_water_duration_tr)
-
-        #8 Num of water periods
-        self.action_water_periods_ts = self.font.render(f"{action_dict['watering_cycles']}", True, self.GREEN)
-        self.action_water_periods_tr = self.action_water_periods_ts.get_rect()
-        self.action_water_periods_tr.center = (pygame.Vector2(250+3*self.x_space,765+self.y_space))
-        self.screen.blit(self.action_water_periods_ts, self.action_water_periods_tr)
-
-        #Equations
-        #1 Biomass
-        self.biomass_ts = self.font.render(f"{self.biomass} KG", True, self.GREEN)
-        self.biomass_tr = self.biomass_ts.get_rect()
-        self.biomass_tr.center = (pygame.Vector2(192,370))
-        self.screen.blit(self.biomass_ts, self.biomass_tr)
-
-        #2 Height
-        self.height_ts = self.font.render(f"{self.height} CM", True, self.GREEN)
-        self.height_tr = self.height_ts.get_rect()
-        self.height_tr.center = (pygame.Vector2(192,516))
-        self.screen.blit(self.height_ts, self.height_tr)
-
-        pygame.display.flip()
-
-        self.dt = self.clock.tick(60) / 1000
-        return self.state, self.reward, terminated, truncated, {}
\ No newline at end of file
+        if self.last_action_dict is not None:
+            #Environment
+            #1 Temp
+            self.temp_ts = self.font.render(f"{self.temp} C", True, self.GREEN)
+            self.temp_tr = self.temp_ts.get_rect()
+            self.temp_tr.center = (pygame.Vector2(250,60))
+            self.screen.blit(self.temp_ts, self.temp_tr)
+
+            #2 RH
+            self.rh_ts = self.font.render(f"{self.RH}%", True, self.GREEN)
+            self.rh_tr = self.rh_ts.get_rect()
+            self.rh_tr.center = (pygame.Vector2(250,60+self.y_space))
+            self.screen.blit(self.rh_ts, self.rh_tr)
+
+            #3 PH
+            self.ph_ts = self.font.render(f"{self.ph}", True, self.GREEN)
+            self.ph_tr = self.ph_ts.get_rect()
+            self.ph_tr.center = (pygame.Vector2(250+self.x_space,60))
+            self.screen.blit(self.ph_ts, self.ph_tr)
+
+            #4 EC
+            self.ec_ts = self.font.render(f"{self.ec}", True, self.GREEN)
+            self.ec_tr = self.ec_ts.get_rect()
+            self.ec_tr.center = (pygame.Vector2(250+self.x_space,60+self.y_space))
+            self.screen.blit(self.ec_ts, self.ec_tr)
+
+            #5 Light Intensity
+            self.light_intensity_ts = self.font.render(f"{self.light_intensity} LUX", True, self.GREEN)
+            self.light_intensity_tr = self.light_intensity_ts.get_rect()
+            self.light_intensity_tr.center = (pygame.Vector2(250+2*self.x_space,60))
+            self.screen.blit(self.light_intensity_ts, self.light_intensity_tr)
+
+            #6 Light duration
+            self.light_duration_ts = self.font.render(f"{self.light_duration} mins", True, self.GREEN)
+            self.light_duration_tr = self.light_duration_ts.get_rect()
+            self.light_duration_tr.center = (pygame.Vector2(250+2*self.x_space,60+self.y_space))
+            self.screen.blit(self.light_duration_ts, self.light_duration_tr)
+
+            #7 Water duration/period
+            self.water_duration_ts = self.font.render(f"{self.watering_period} mins", True, self.GREEN)
+            self.water_duration_tr = self.water_duration_ts.get_rect()
+            self.water_duration_tr.center = (pygame.Vector2(250+3*self.x_space,60))
+            self.screen.blit(self.water_duration_ts, self.water_duration_tr)
+
+            #8 Num of water periods
+            self.water_periods_ts = self.font.render(f"{self.watering_cycles}", True, self.GREEN)
+            self.water_periods_tr = self.water_periods_ts.get_rect()
+            self.water_periods_tr.center = (pygame.Vector2(250+3*self.x_space,60+self.y_space))
+            self.screen.blit(self.water_periods_ts, self.water_periods_tr)
+
+            #9 Day
+            self.day_ts = self.font.render(f"{self.day}", True, self.GREEN)
+            self.day_tr = self.water_periods_ts.get_rect()
+            self.day_tr.center = (pygame.Vector2(725,221))
+            self.screen.blit(self.day_ts, self.day_tr)
+
+            #Actions
+            #1 Temp
+            self.action_temp_ts = self.font.render(f"{self.last_action_dict['temp']+10} C", True, self.GREEN)
+            self.action_temp_tr = self.action_temp_ts.get_rect()
+            self.action_temp_tr.center = (pygame.Vector2(250,765))
+            self.screen.blit(self.action_temp_ts, self.action_temp_tr)
+
+            #2 RH
+            self.action_rh_ts = self.font.render(f"{self.last_action_dict['RH']+30}%", True, self.GREEN)
+            self.action_rh_tr = self.action_rh_ts.get_rect()
+            self.action_rh_tr.center = (pygame.Vector2(250,765+self.y_space))
+            self.screen.blit(self.action_rh_ts, self.action_rh_tr)
+
+            #3 PH
+            self.action_ph_ts = self.font.render(f"{4.0 + (self.last_action_dict['ph'] * 0.1)}", True, self.GREEN)
+            self.action_ph_tr = self.action_ph_ts.get_rect()
+            self.action_ph_tr.center = (pygame.Vector2(250+self.x_space,765))
+            self.screen.blit(self.action_ph_ts, self.action_ph_tr)
+
+            #4 EC
+            self.action_ec_ts = self.font.render(f"{self.last_action_dict['ec'] * 0.1}", True, self.GREEN)
+            self.action_ec_tr = self.action_ec_ts.get_rect()
+            self.action_ec_tr.center = (pygame.Vector2(250+self.x_space,765+self.y_space))
+            self.screen.blit(self.action_ec_ts, self.action_ec_tr)
+
+            #5 Light Intensity
+            self.action_light_intensity_ts = self.font.render(f"{self.last_action_dict['light_intensity'] * 500}", True, self.GREEN)
+            self.action_light_intensity_tr = self.action_light_intensity_ts.get_rect()
+            self.action_light_intensity_tr.center = (pygame.Vector2(250+2*self.x_space,765))
+            self.screen.blit(self.action_light_intensity_ts, self.action_light_intensity_tr)
+
+            #6 Light duration
+            self.action_light_duration_ts = self.font.render(f"{self.last_action_dict['light_duration'] * 30}", True, self.GREEN)
+            self.action_light_duration_tr = self.action_light_duration_ts.get_rect()
+            self.action_light_duration_tr.center = (pygame.Vector2(250+2*self.x_space,765+self.y_space))
+            self.screen.blit(self.action_light_duration_ts, self.action_light_duration_tr)
+
+            #7 Water duration/period
+            self.action_water_duration_ts = self.font.render(f"{30 * self.last_action_dict['watering_period'] }", True, self.GREEN)
+            self.action_water_duration_tr = self.action_water_duration_ts.get_rect()
+            self.action_water_duration_tr.center = (pygame.Vector2(250+3*self.x_space,765))
+            self.screen.blit(self.action_water_duration_ts, self.action_water_duration_tr)
+
+            #8 Num of water periods
+            self.action_water_periods_ts = self.font.render(f"{self.last_action_dict['watering_cycles']}", True, self.GREEN)
+            self.action_water_periods_tr = self.action_water_periods_ts.get_rect()
+            self.action_water_periods_tr.center = (pygame.Vector2(250+3*self.x_space,765+self.y_space))
+            self.screen.blit(self.action_water_periods_ts, self.action_water_periods_tr)
+
+            #Equations
+            #1 Biomass
+            self.biomass_ts = self.font.render(f"{self.biomass} KG", True, self.GREEN)
+            self.biomass_tr = self.biomass_ts.get_rect()
+            self.biomass_tr.center = (pygame.Vector2(192,370))
+            self.screen.blit(self.biomass_ts, self.biomass_tr)
+
+            #2 Height
+            self.height_ts = self.font.render(f"{self.height} CM", True, self.GREEN)
+            self.height_tr = self.height_ts.get_rect()
+            self.height_tr.center = (pygame.Vector2(192,516))
+            self.screen.blit(self.height_ts, self.height_tr)
+
+        if self.render_mode == "human":
+            pygame.display.flip()
+            self.dt = self.clock.tick(self.metadata["render_fps"]) / 1000
+            return None
+        return np.transpose(np.array(pygame.surfarray.pixels3d(self.screen)), axes=(1, 0, 2))
+
+    def __getstate__(self):
+        # pygame objects can't be pickled or shared with worker processes, they are recreated on the next frame
+        state = self.__dict__.copy()
+        for name in self.__dict__:
+            if name in RENDER_ATTRIBUTES or name.endswith("_ts"):
+                del state[name]
+        state["screen"] = None
+        state["clock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def close(self):
+        if self.screen is not None:
+            import pygame
+            if self.render_mode == "human":
+                pygame.display.quit()
+            pygame.quit()
+            self.screen = None
+            self.clock = None
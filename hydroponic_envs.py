@@ -0,0 +1,27 @@
+from gymnasium.envs.registration import register, registry
+
+# Versioned IDs of HydroponicEnv, every kwarg can be overridden in gym.make / gym.make_vec, e.g.
+# gym.make("HydroponicEnv-v0", plant_config="Lavender.py", episode_length=250, render_mode="human")
+# (Config plants get their actions decoded to physical units, see action_tables.decode_actions)
+# gym.make_vec("HydroponicEnvBox-v0", num_envs=64, action_repeat=7) holds every action for a week
+# Entry points are strings so gym_env (and pygame, only when rendering) is imported on the first make.
+DEFAULT_KWARGS = {"plant_config": None, "episode_length": 1000, "action_repeat": 1}
+ENV_SPECS = {
+    "HydroponicEnv-v0": {"observation_mode": "dict"},
+    "HydroponicEnvBox-v0": {"observation_mode": "box", "lookup_tables": True},
+}
+
+
+def register_envs():
+    for env_id, kwargs in ENV_SPECS.items():
+        if env_id in registry:
+            continue
+        register(
+            id=env_id,
+            entry_point="gym_env:HydroponicEnv",
+            vector_entry_point="vector_env:HydroponicVectorEnv",
+            kwargs={**DEFAULT_KWARGS, **kwargs},
+        )
+
+
+register_envs()
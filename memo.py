@@ -0,0 +1,74 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from growth_model import stage_inputs
+from replay import READING_FIELDS
+from reward import REWARD_FIELDS, compute_reward
+
+# Step of every condition in Config units. The env's decoded actions and the Simulation.py sliders are multiples of
+# these, so snapping never moves their values, it only merges closer points (e.g. temperatures 0.5 apart).
+CONDITION_RESOLUTION = {
+    "light_intensity": 1.0,
+    "light_duration": 0.5,
+    "temperature": 0.5,
+    "RH": 1.0,
+    "PH": 0.1,
+    "EC": 0.1,
+    "water_duration": 0.5,
+    "water_cycles": 1.0,
+}
+
+
+class EvaluationCache:
+    # Bounded LRU memo of the growth factors and damage terms of a (plant, stage, conditions) point. plant_key
+    # identifies the plant's settings and stage count, GrowthModel.cache_key holds a hash of them.
+    # Conditions are snapped to resolution (None keeps exact values) and the key holds the grid indices, so nearby
+    # queries share an entry and the stored terms are those of the snapped point.
+    # An entry is the reward breakdown at RUE = 1, callers fill in their day's RUE and run reward.finish_reward.
+    def __init__(self, maxsize=65536, resolution=CONDITION_RESOLUTION):
+        self.maxsize = maxsize
+        self.resolution = resolution
+        # Grid steps per unit, index / steps gives 6.7 for PH index 67 where index * 0.1 would not
+        self.steps = None if resolution is None else {name: 1 / step for name, step in resolution.items()}
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, plant_key, stage, conditions):
+        if self.resolution is None:
+            return (plant_key, int(stage)) + tuple(float(conditions[name]) for name in READING_FIELDS)
+        return (plant_key, int(stage)) + tuple(round(conditions[name] * self.steps[name]) for name in READING_FIELDS)
+
+    def terms(self, plant_key, profile, damage_engine, stage, conditions):
+        # conditions maps every READING_FIELDS name to one value, the returned row must not be modified
+        key = self.key(plant_key, stage, conditions)
+        row = self.entries.get(key)
+        if row is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return row
+
+        self.misses += 1
+        if self.resolution is None:
+            snapped = {name: conditions[name] for name in READING_FIELDS}
+        else:
+            snapped = {name: index / self.steps[name] for name, index in zip(READING_FIELDS, key[2:])}
+        growth_inputs, damage_conditions = stage_inputs(snapped)
+        row = np.empty(len(REWARD_FIELDS))
+        compute_reward(profile, damage_engine, stage, 1.0, growth_inputs, damage_conditions, out=row)
+        self.entries[key] = row
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return row
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"size": len(self.entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,68 @@
+import functools
+
+import numpy as np
+from gymnasium import spaces
+
+# Fixed layout of the flat observations, OBSERVATION_INDEX maps every Dict key to its position
+OBSERVATION_KEYS = ("plant_stage", "day", "watering_cycles", "watering_period", "temp", "RH",
+                    "light_intensity", "light_duration", "ec", "ph")
+# Sizes for a 364 day episode, the envs size the day entry from their episode_length (observation_nvec)
+OBSERVATION_NVEC = (5, 365, 11, 49, 51, 61, 41, 49, 51, 51)
+OBSERVATION_INDEX = {key: i for i, key in enumerate(OBSERVATION_KEYS)}
+DAY = OBSERVATION_INDEX["day"]
+
+# "dict": the spaces.Dict observation
+# "flat": one uint16 vector of the same discrete values (MultiDiscrete)
+# "box": the flat vector scaled to [0, 1] as float32, for MlpPolicy without one-hot encoding
+OBSERVATION_MODES = ("dict", "flat", "box")
+
+
+def observation_nvec(episode_length=364):
+    # day counts 0..episode_length
+    if episode_length >= np.iinfo(np.uint16).max:
+        raise ValueError("episode_length must fit the uint16 flat observation")
+    nvec = list(OBSERVATION_NVEC)
+    nvec[DAY] = episode_length + 1
+    return tuple(nvec)
+
+
+@functools.lru_cache(maxsize=None)
+def observation_scale(episode_length=364):
+    # Per entry factor of the "box" mode, the largest value of every entry maps to 1
+    return 1.0 / (np.array(observation_nvec(episode_length), dtype=np.float32) - 1)
+
+
+def observation_space(observation_mode="dict", episode_length=364):
+    nvec = observation_nvec(episode_length)
+    if observation_mode == "dict":
+        return spaces.Dict({key: spaces.Discrete(n) for key, n in zip(OBSERVATION_KEYS, nvec)})
+    if observation_mode == "flat":
+        return spaces.MultiDiscrete(nvec, dtype=np.uint16)
+    if observation_mode == "box":
+        return spaces.Box(0.0, 1.0, shape=(len(OBSERVATION_KEYS),), dtype=np.float32)
+    raise ValueError(f"observation_mode must be one of {OBSERVATION_MODES}, got {observation_mode!r}")
+
+
+def observation_buffer(observation_mode, batch_shape=()):
+    if observation_mode == "flat":
+        return np.zeros(batch_shape + (len(OBSERVATION_KEYS),), dtype=np.uint16)
+    if observation_mode == "box":
+        return np.zeros(batch_shape + (len(OBSERVATION_KEYS),), dtype=np.float32)
+    return None
+
+
+def flatten_observation(observation, observation_mode, out, episode_length=364):
+    # Writes a Dict observation (scalars or (N,) arrays) into the reused flat buffer out
+    for i, key in enumerate(OBSERVATION_KEYS):
+        out[..., i] = observation[key]
+    if observation_mode == "box":
+        out *= observation_scale(episode_length)
+    return out
+
+
+def unflatten_observation(vector, observation_mode="flat", episode_length=364):
+    # Rebuilds the Dict view of a flat or box observation
+    vector = np.asarray(vector)
+    if observation_mode == "box":
+        vector = np.rint(vector / observation_scale(episode_length)).astype(np.int64)
+    return {key: vector[..., i].astype(np.int64) for key, i in OBSERVATION_INDEX.items()}
@@ -0,0 +1,118 @@
+import json
+import os
+from collections import OrderedDict
+
+from plant_config import CACHE_FOLDER, load_plant_config
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
+INDEX_FILE = "plant_index.json"
+INDEX_VERSION = 1
+
+
+def scan_catalog(config_folder='Config', image_folder='Plant_pics', exclude_file='plant_temp.py',
+                 default_image='Default_image.png'):
+    # Species name -> {"config": file name, "image": file name} from one listing of each folder. A .py config wins
+    # over a .json one of the same name, species without a picture get default_image.
+    images = {}
+    with os.scandir(image_folder) as entries:
+        for entry in entries:
+            name, extension = os.path.splitext(entry.name)
+            if extension.lower() in IMAGE_EXTENSIONS and entry.is_file():
+                images.setdefault(name, entry.name)
+
+    configs = {}
+    with os.scandir(config_folder) as entries:
+        for entry in entries:
+            name, extension = os.path.splitext(entry.name)
+            if extension in ('.py', '.json') and entry.name != exclude_file and entry.is_file():
+                if extension == '.py' or name not in configs:
+                    configs[name] = entry.name
+    return {name: {"config": configs[name], "image": images.get(name, default_image)} for name in sorted(configs)}
+
+
+def _folder_stamp(folder):
+    # Changes whenever a file is added, removed or renamed in folder
+    return os.stat(folder).st_mtime_ns
+
+
+class PlantCatalog:
+    # Index of the species of config_folder and their pictures in image_folder. The index is kept in
+    # <config_folder>/__plantcache__/plant_index.json and only rebuilt when either folder's listing changed, so
+    # opening a picker does not touch the images. Pictures are loaded and scaled when a species is shown, the scaled
+    # surfaces are kept in a bounded LRU cache of max_thumbnails entries.
+    def __init__(self, config_folder='Config', image_folder='Plant_pics', exclude_file='plant_temp.py',
+                 default_image='Default_image.png', max_thumbnails=64):
+        self.config_folder = config_folder
+        self.image_folder = image_folder
+        self.default_image = default_image
+        self.max_thumbnails = max_thumbnails
+        self.thumbnails = OrderedDict()
+        self.index_path = os.path.join(config_folder, CACHE_FOLDER, INDEX_FILE)
+
+        # The cache folder is created first, creating it later would change config_folder's stamp
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        except OSError:
+            pass
+        stamp = [_folder_stamp(config_folder), _folder_stamp(image_folder)]
+        key = {"version": INDEX_VERSION, "stamp": stamp, "exclude_file": exclude_file, "default_image": default_image}
+        self.species = self._read_index(key)
+        if self.species is None:
+            self.species = scan_catalog(config_folder, image_folder, exclude_file, default_image)
+            self._write_index(dict(key, species=self.species))
+        self.names = list(self.species)
+
+    def _read_index(self, key):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if any(index.get(name) != value for name, value in key.items()):
+            return None
+        return index["species"]
+
+    def _write_index(self, index):
+        try:
+            temporary = f"{self.index_path}.{os.getpid()}.partial"
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(temporary, self.index_path)
+        except OSError:
+            # A read-only config folder rebuilds the index every time
+            pass
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.species
+
+    def config_file(self, name):
+        return self.species[name]["config"]
+
+    def image_path(self, name):
+        return os.path.join(self.image_folder, self.species[name]["image"])
+
+    def load_plant(self, name):
+        return load_plant_config(self.config_file(name), self.config_folder)
+
+    def thumbnail(self, name, size):
+        # name's picture scaled to fit in size (width, height), loaded on first use
+        import pygame
+        key = (self.species[name]["image"], tuple(size))
+        surface = self.thumbnails.get(key)
+        if surface is not None:
+            self.thumbnails.move_to_end(key)
+            return surface
+
+        image = pygame.image.load(self.image_path(name))
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        scale = min(size[0] / image.get_width(), size[1] / image.get_height())
+        surface = pygame.transform.smoothscale(image, (max(round(image.get_width() * scale), 1),
+                                                       max(round(image.get_height() * scale), 1)))
+        self.thumbnails[key] = surface
+        if len(self.thumbnails) > self.max_thumbnails:
+            self.thumbnails.popitem(last=False)
+        return surface
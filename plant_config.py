@@ -0,0 +1,276 @@
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import types
+
+import numpy as np
+
+# Order of the factors in the stage-indexed arrays of PlantProfile
+GROWTH_FACTORS = ("DLI", "temperature", "PH", "EC", "RH", "water_duration", "water_cycles")
+DAMAGE_FACTORS = ("light_intensity", "light_duration", "temperature", "RH", "PH", "EC", "TWD")
+CONDITION_NAMES = ("light_intensity", "light_duration", "DLI", "temperature", "RH", "PH", "EC", "water_duration",
+                   "water_cycles")
+NUM_STAGES = 5
+
+SCALARS = ("MAX_BIOMASS", "LIFETIME", "K", "A", "DAMAGE_SENSITIVITY", "MANUAL_STAGES")
+TABLES = ("OPTIMAL_CONDITIONS", "GROWTH_SIGMAS", "LOW_PARAMETERS", "HIGH_PARAMETERS")
+# Settings a config may leave out
+DEFAULTS = {"DAMAGE_SENSITIVITY": 0.0}
+# Compiled configs are pickled to <config_folder>/__plantcache__/<name>.pkl, bump CACHE_VERSION when the layout
+# changes. The cache is as trusted as the Config/*.py files it is built from.
+CACHE_FOLDER = "__plantcache__"
+CACHE_VERSION = 1
+
+
+def load_config_module(file_name, config_folder='Config'):
+    if not file_name.endswith('.py'):
+        raise ValueError("Expected a .py file name")
+
+    module_name = os.path.splitext(file_name)[0]
+    file_path = os.path.join(config_folder, file_name)
+
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Config file '{file_path}' does not exist.")
+
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def config_problems(plant):
+    # Every inconsistency of a Config module (or CompiledPlant), an empty list when it is valid
+    problems = []
+    for name in SCALARS + TABLES + ("NUMBER_OF_DAYS_PER_STAGE",):
+        if not hasattr(plant, name) and name not in DEFAULTS:
+            problems.append(f"{name} is missing")
+    if problems:
+        return problems
+    for name in SCALARS:
+        if not isinstance(getattr(plant, name, DEFAULTS.get(name)), (int, float, np.number)):
+            problems.append(f"{name} must be a number")
+    if problems:
+        return problems
+
+    if not plant.MAX_BIOMASS > 0:
+        problems.append("MAX_BIOMASS must be positive")
+    if int(plant.LIFETIME) != plant.LIFETIME or plant.LIFETIME < 1:
+        problems.append("LIFETIME must be a positive whole number of days")
+    if plant.A == 0:
+        problems.append("A must not be 0")
+    if getattr(plant, "DAMAGE_SENSITIVITY", 0.0) < 0:
+        problems.append("DAMAGE_SENSITIVITY must not be negative")
+    days = list(plant.NUMBER_OF_DAYS_PER_STAGE)
+    if len(days) != NUM_STAGES:
+        problems.append(f"NUMBER_OF_DAYS_PER_STAGE must have {NUM_STAGES} entries, got {len(days)}")
+    elif plant.MANUAL_STAGES and sum(days) != plant.LIFETIME:
+        problems.append("NUMBER_OF_DAYS_PER_STAGE must sum to LIFETIME")
+
+    for table, names in (("OPTIMAL_CONDITIONS", CONDITION_NAMES), ("GROWTH_SIGMAS", GROWTH_FACTORS)):
+        values = getattr(plant, table)
+        for name in names:
+            if name not in values:
+                problems.append(f"{table}[{name!r}] is missing")
+            elif len(values[name]) != NUM_STAGES:
+                problems.append(f"{table}[{name!r}] must have {NUM_STAGES} stages, got {len(values[name])}")
+            elif table == "GROWTH_SIGMAS" and not all(sigma > 0 for sigma in values[name]):
+                problems.append(f"GROWTH_SIGMAS[{name!r}] must be positive")
+
+    for table in ("LOW_PARAMETERS", "HIGH_PARAMETERS"):
+        values = getattr(plant, table)
+        for name in DAMAGE_FACTORS:
+            if name not in values:
+                problems.append(f"{table}[{name!r}] is missing")
+                continue
+            stages = np.asarray(values[name], dtype=np.float64)
+            if stages.shape != (NUM_STAGES, 3):
+                problems.append(f"{table}[{name!r}] must be {NUM_STAGES} [critical, limit, gamma] rows, "
+                                f"got shape {stages.shape}")
+            elif table == "LOW_PARAMETERS" and not np.all(stages[:, 0] > stages[:, 1]):
+                problems.append(f"LOW_PARAMETERS[{name!r}]: critical low must be above the minimum")
+            elif table == "HIGH_PARAMETERS" and not np.all(stages[:, 0] < stages[:, 1]):
+                problems.append(f"HIGH_PARAMETERS[{name!r}]: critical high must be below the maximum")
+    return problems
+
+
+def validate_plant(plant, name="plant"):
+    problems = config_problems(plant)
+    if problems:
+        raise ValueError(f"Invalid config {name}: " + "; ".join(problems))
+    return plant
+
+
+class CompiledPlant:
+    # The values of a Config module as NumPy arrays, usable wherever a Config module is (PlantProfile,
+    # GrowthModel, SpeciesBatch). Stage lists are (stage,) arrays, LOW/HIGH_PARAMETERS (stage, 3) arrays.
+    def __init__(self, name, arrays):
+        self.__name__ = name
+        # item() keeps ints ints, so the RUE curve is computed exactly as from the module
+        self.MAX_BIOMASS = arrays["MAX_BIOMASS"].item()
+        self.LIFETIME = int(arrays["LIFETIME"])
+        self.K = arrays["K"].item()
+        self.A = arrays["A"].item()
+        self.DAMAGE_SENSITIVITY = arrays["DAMAGE_SENSITIVITY"].item()
+        self.MANUAL_STAGES = bool(arrays["MANUAL_STAGES"])
+        self.NUMBER_OF_DAYS_PER_STAGE = [int(days) for days in arrays["NUMBER_OF_DAYS_PER_STAGE"]]
+        for table in TABLES:
+            prefix = table + "."
+            setattr(self, table, {key[len(prefix):]: values for key, values in arrays.items()
+                                  if key.startswith(prefix)})
+
+
+def compile_plant(plant):
+    # Flat name -> array dict of a validated Config module, what the cache files store
+    arrays = {name: np.asarray(getattr(plant, name, DEFAULTS.get(name))) for name in SCALARS}
+    arrays["NUMBER_OF_DAYS_PER_STAGE"] = np.asarray(plant.NUMBER_OF_DAYS_PER_STAGE, dtype=np.int64)
+    for table in TABLES:
+        for name, values in getattr(plant, table).items():
+            arrays[f"{table}.{name}"] = np.asarray(values, dtype=np.float64)
+    return arrays
+
+
+def load_plant_config(file_name, config_folder='Config', cache=True):
+    # Validated CompiledPlant of Config/<file_name>, a .py config or a data-only .json one. The compiled arrays of
+    # .py configs are cached next to them and reused while the file's mtime (or, after a touch, its SHA-256) is
+    # unchanged, a warm load reads one file and never executes the config. Invalid configs raise ValueError naming
+    # every problem.
+    file_path = os.path.join(config_folder, file_name)
+    name = os.path.splitext(file_name)[0]
+    if not file_name.endswith(('.py', '.json')):
+        raise ValueError("Expected a .py or .json file name")
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Config file '{file_path}' does not exist.")
+    if file_name.endswith('.json'):
+        return read_plant_json(file_path)
+    cache_path = os.path.join(config_folder, CACHE_FOLDER, name + ".pkl")
+    mtime = os.stat(file_path).st_mtime_ns
+
+    digest = None
+    cached = _read_cache(cache_path) if cache else None
+    if cached is not None:
+        arrays = cached["arrays"]
+        if cached["mtime"] == mtime:
+            return CompiledPlant(name, arrays)
+        digest = _sha256(file_path)
+        if cached["sha256"] == digest:
+            _write_cache(cache_path, arrays, mtime, digest)
+            return CompiledPlant(name, arrays)
+
+    plant = validate_plant(load_config_module(file_name, config_folder), file_path)
+    arrays = compile_plant(plant)
+    if cache:
+        _write_cache(cache_path, arrays, mtime, digest or _sha256(file_path))
+    return CompiledPlant(name, arrays)
+
+
+def _sha256(file_path):
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _read_cache(cache_path):
+    # The cached entry, None when there is none or it can't be used (truncated, garbled, from another
+    # CACHE_VERSION or another numpy / Python), the config is then compiled again and the cache rewritten
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+        if cached["version"] != CACHE_VERSION or not {"mtime", "sha256", "arrays"} <= cached.keys():
+            return None
+        # Raises on arrays that are missing settings
+        CompiledPlant("", cached["arrays"])
+    except (OSError, EOFError, pickle.UnpicklingError, ImportError, AttributeError, KeyError, TypeError,
+            ValueError):
+        return None
+    return cached
+
+
+def _write_cache(cache_path, arrays, mtime, digest):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temporary = f"{cache_path}.{os.getpid()}.partial"
+        with open(temporary, "wb") as f:
+            pickle.dump({"version": CACHE_VERSION, "mtime": mtime, "sha256": digest, "arrays": arrays}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, cache_path)
+    except OSError:
+        # A read-only config folder still loads, just without the cache
+        pass
+
+
+# Data-only configs: the settings of a Config module as one JSON object with the same names, e.g.
+#   {"MAX_BIOMASS": 950, "LIFETIME": 190, "MANUAL_STAGES": false, "NUMBER_OF_DAYS_PER_STAGE": [0, 0, 0, 0, 0],
+#    "OPTIMAL_CONDITIONS": {"light_intensity": [10000, ...], ...}, "GROWTH_SIGMAS": {...}, "K": 5, "A": 3,
+#    "LOW_PARAMETERS": {"light_intensity": [[5000, 0, 6], ...], ...}, "HIGH_PARAMETERS": {...},
+#    "DAMAGE_SENSITIVITY": 0.0}
+# Reading one only parses data, so they can come from untrusted sources.
+def plant_data(plant):
+    # JSON-ready dict of the settings of a Config module or CompiledPlant
+    data = {name: np.asarray(getattr(plant, name, DEFAULTS.get(name))).tolist() for name in SCALARS}
+    data["NUMBER_OF_DAYS_PER_STAGE"] = [int(days) for days in plant.NUMBER_OF_DAYS_PER_STAGE]
+    for table in TABLES:
+        data[table] = {name: np.asarray(values).tolist() for name, values in getattr(plant, table).items()}
+    return data
+
+
+def plant_digest(plant):
+    # SHA-256 of the settings of a Config module or CompiledPlant, equal for a .py config and its .json conversion
+    return hashlib.sha256(json.dumps(plant_data(plant), sort_keys=True).encode()).hexdigest()
+
+
+def plant_from_data(name, data):
+    # Validated CompiledPlant of a plant_data dict
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid config {name}: expected a JSON object")
+    unknown = sorted(set(data) - set(SCALARS + TABLES + ("NUMBER_OF_DAYS_PER_STAGE",)))
+    if unknown:
+        raise ValueError(f"Invalid config {name}: unknown settings {', '.join(unknown)}")
+    plant = types.SimpleNamespace(**data)
+    try:
+        problems = config_problems(plant)
+        arrays = None if problems else compile_plant(plant)
+    except (TypeError, ValueError) as error:
+        # Strings or nested lists where numbers belong
+        problems = [f"malformed values ({error})"]
+    if problems:
+        raise ValueError(f"Invalid config {name}: " + "; ".join(problems))
+    return CompiledPlant(name, arrays)
+
+
+def read_plant_json(file_path):
+    with open(file_path, encoding="utf-8") as f:
+        data = json.load(f)
+    return plant_from_data(os.path.splitext(os.path.basename(file_path))[0], data)
+
+
+def write_plant_json(plant, file_path):
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(plant_data(plant), f, indent=2)
+        f.write("\n")
+
+
+def convert_configs(config_folder='Config', out_folder=None):
+    # Writes <out_folder>/<name>.json for every .py config of config_folder (out_folder defaults to config_folder),
+    # returns the written paths
+    out_folder = out_folder or config_folder
+    os.makedirs(out_folder, exist_ok=True)
+    paths = []
+    for file_name in sorted(os.listdir(config_folder)):
+        if not file_name.endswith(".py"):
+            continue
+        path = os.path.join(out_folder, os.path.splitext(file_name)[0] + ".json")
+        write_plant_json(load_plant_config(file_name, config_folder), path)
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert Config/*.py plant configs to data-only JSON files")
+    parser.add_argument("--config-folder", default="Config")
+    parser.add_argument("--out", default=None, help="Output folder, defaults to the config folder")
+    args = parser.parse_args()
+    for path in convert_configs(args.config_folder, args.out):
+        print(path)
@@ -0,0 +1,116 @@
+import math
+
+import numpy as np
+
+from plant_config import DAMAGE_FACTORS, GROWTH_FACTORS, load_plant_config
+
+
+def load_plant(plant, config_folder='Config'):
+    # A Config module, or the file name of one in config_folder (loaded validated, through the compiled cache)
+    if isinstance(plant, str):
+        return load_plant_config(plant, config_folder)
+    return plant
+
+
+def growth_stage_durations(lifetime_days: int, num_stages: int):
+    if not (1 <= num_stages <= 5):
+        raise ValueError("Number of stages must be between 1 and 5.")
+
+    stage_ratios_dict = {
+        1: [1.0],
+        2: [0.4, 0.6],
+        3: [0.15, 0.55, 0.30],
+        4: [0.1, 0.35, 0.35, 0.2],
+        5: [0.05, 0.20, 0.35, 0.25, 0.15]
+    }
+
+    ratios = stage_ratios_dict[num_stages]
+    durations = [round(r * lifetime_days) for r in ratios]
+
+    difference = lifetime_days - sum(durations)
+    if difference != 0:
+        durations[-1] += difference
+
+    return durations
+
+
+def plant_stage_durations(plant, num_stages=5):
+    if plant.MANUAL_STAGES:
+        durations = list(plant.NUMBER_OF_DAYS_PER_STAGE)
+        if sum(durations) != plant.LIFETIME:
+            raise ValueError("NUMBER_OF_DAYS_PER_STAGE must sum to LIFETIME.")
+        return durations
+    return growth_stage_durations(plant.LIFETIME, num_stages)
+
+
+class PlantProfile:
+    # Everything the growth model needs from a Config/*.py module, computed once.
+    # rue[day] and stage_index[day] are tabulated for days 0..horizon-1 (horizon defaults to LIFETIME + 1).
+    def __init__(self, plant, num_stages=5, horizon=None):
+        self.max_biomass = plant.MAX_BIOMASS
+        self.lifetime = plant.LIFETIME
+        self.K = plant.K
+        self.A = plant.A
+        self.damage_sensitivity = getattr(plant, "DAMAGE_SENSITIVITY", 0.0)
+        self.stage_durations = plant_stage_durations(plant, num_stages)
+        self.num_stages = len(self.stage_durations)
+        if horizon is None:
+            horizon = self.lifetime + 1
+
+        self.rue_max = self.max_biomass / sum(
+            math.exp(-((x - self.K) ** 2) / (2 * self.A ** 2)) for x in range(self.lifetime + 1))
+        self.rue = np.array([self._rue(day) for day in range(horizon)])
+        # rue_prefix[d] is the RUE summed over days 0..d-1
+        self.rue_prefix = np.concatenate([[0.0], np.cumsum(self.rue)])
+
+        stage_ends = np.cumsum(self.stage_durations)
+        self.stage_index = np.minimum(np.searchsorted(stage_ends, np.arange(horizon), side="right"),
+                                      self.num_stages - 1)
+
+        optimals = plant.OPTIMAL_CONDITIONS
+        self.optimal_conditions = {name: np.array(values, dtype=np.float64) for name, values in optimals.items()}
+        self.growth_sigmas = {name: np.array(values, dtype=np.float64) for name, values in plant.GROWTH_SIGMAS.items()}
+
+        # (stage, factor) arrays in GROWTH_FACTORS / DAMAGE_FACTORS order
+        self.growth_optimal = np.stack([self.optimal_conditions[name] for name in GROWTH_FACTORS], axis=1)
+        self.growth_sigma = np.stack([self.growth_sigmas[name] for name in GROWTH_FACTORS], axis=1)
+        damage_optimals = dict(self.optimal_conditions)
+        damage_optimals["TWD"] = self.optimal_conditions["water_duration"] * self.optimal_conditions["water_cycles"]
+        self.damage_optimal = np.stack([damage_optimals[name] for name in DAMAGE_FACTORS], axis=1)
+
+        # (stage, factor, [critical, max, gamma]) arrays
+        self.low_parameters = np.stack([np.array(plant.LOW_PARAMETERS[name], dtype=np.float64)
+                                        for name in DAMAGE_FACTORS], axis=1)
+        self.high_parameters = np.stack([np.array(plant.HIGH_PARAMETERS[name], dtype=np.float64)
+                                         for name in DAMAGE_FACTORS], axis=1)
+
+    def _rue(self, day):
+        return self.rue_max * math.exp(-((day - self.K) ** 2) / (2 * self.A ** 2))
+
+    def rue_at(self, day):
+        if 0 <= day < len(self.rue):
+            return self.rue[day]
+        return self._rue(day)
+
+    def rue_for_days(self, days):
+        # Array version of rue_at
+        days = np.asarray(days)
+        last = len(self.rue) - 1
+        rue = self.rue[np.clip(days, 0, last)]
+        outside = (days < 0) | (days > last)
+        if outside.any():
+            rue = np.where(outside, self.rue_max * np.exp(-((days - self.K) ** 2) / (2 * self.A ** 2)), rue)
+        return rue
+
+    def stage_for_days(self, days):
+        # Array version of stage_at
+        return self.stage_index[np.minimum(days, len(self.stage_index) - 1)]
+
+    def stage_at(self, day):
+        if day < 0:
+            raise ValueError("Current day must be non-negative.")
+        return int(self.stage_index[min(day, len(self.stage_index) - 1)])
+
+
+def load_plant_profile(file_name, config_folder='Config', num_stages=5, horizon=None):
+    return PlantProfile(load_plant_config(file_name, config_folder), num_stages, horizon)
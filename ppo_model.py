@@ -2,61 +2,66 @@ import gym
 from stable_baselines3 import PPO
 from stable_baselines3.common.env_checker import check_env
 from gym_env import HydroponicEnv  # make sure HydroponicEnv is gym-compliant
+from env_factory import make_subproc_vec_env
 from stable_baselines3.common.callbacks import EvalCallback
 from stable_baselines3.common.evaluation import evaluate_policy
 from stable_baselines3.common.monitor import Monitor
 
 
 
-# Create the environment
-env = HydroponicEnv()
-eval_env = Monitor(HydroponicEnv())
+# Workers re-import this module with the spawn/forkserver start methods
+if __name__ == "__main__":
+    # Create the environment
+    # headless, no pygame window or frame limiter, flat float32 observations for MlpPolicy
+    # one worker process per core collects the rollouts
+    env = make_subproc_vec_env(n_envs=None, seed=0, render_mode=None, observation_mode="box")
+    eval_env = Monitor(HydroponicEnv(render_mode=None, observation_mode="box"))
 
 
-# Optional: Check if environment follows Gym API
-# check_env(env, warn=True)
+    # Optional: Check if environment follows Gym API
+    # check_env(env, warn=True)
 
-# Instantiate the PPO model
-model = PPO(
-    "MultiInputPolicy",  # Use MultiInputPolicy if your observation space is a dict or complex
-    env,
-    verbose=1,
-    tensorboard_log="./ppo_hydroponic_tensorboard/",
-    n_steps=1024,  # 2048
-    batch_size=64,
-    gae_lambda=0.95,
-    gamma=0.99,
-    n_epochs=10,
-    ent_coef=0.01,
-    learning_rate=3e-4,
-)
+    # Instantiate the PPO model
+    model = PPO(
+        "MlpPolicy",  # Use MultiInputPolicy with observation_mode="dict"
+        env,
+        verbose=1,
+        tensorboard_log="./ppo_hydroponic_tensorboard/",
+        n_steps=1024,  # 2048
+        batch_size=64,
+        gae_lambda=0.95,
+        gamma=0.99,
+        n_epochs=10,
+        ent_coef=0.01,
+        learning_rate=3e-4,
+    )
 
 
-# Train the model
-print("Starting PPO training...")
+    # Train the model
+    print("Starting PPO training...")
 
-eval_callback = EvalCallback(
-    eval_env,
-    best_model_save_path="./best_model/",
-    log_path="./logs/",
-    eval_freq=5000,  # evaluate every 5000 steps
-    n_eval_episodes=5,
-    deterministic=True,
-    render=False
-)
+    eval_callback = EvalCallback(
+        eval_env,
+        best_model_save_path="./best_model/",
+        log_path="./logs/",
+        eval_freq=5000,  # evaluate every 5000 steps
+        n_eval_episodes=5,
+        deterministic=True,
+        render=False
+    )
 
-model.learn(total_timesteps=100 , callback=eval_callback)
+    model.learn(total_timesteps=100 , callback=eval_callback)
 
-# Save the model
-model.save("ppo_hydroponic_model")
+    # Save the model
+    model.save("ppo_hydroponic_model")
 
 
 
-# Evaluate
-mean_reward, std_reward = evaluate_policy(model, env, n_eval_episodes=10, render=False)
-print(f"Mean reward: {mean_reward:.2f} ± {std_reward:.2f}")
+    # Evaluate
+    mean_reward, std_reward = evaluate_policy(model, env, n_eval_episodes=10, render=False)
+    print(f"Mean reward: {mean_reward:.2f} ± {std_reward:.2f}")
 
-# Optionally: evaluate the model
-# from stable_baselines3.common.evaluation import evaluate_policy
-# mean_reward, std_reward = evaluate_policy(model, env, n_eval_episodes=10)
-# print(f"Mean reward: {mean_reward:.2f} ± {std_reward:.2f}")
\ No newline at end of file
+    # Optionally: evaluate the model
+    # from stable_baselines3.common.evaluation import evaluate_policy
+    # mean_reward, std_reward = evaluate_policy(model, env, n_eval_episodes=10)
+    # print(f"Mean reward: {mean_reward:.2f} ± {std_reward:.2f}")
@@ -0,0 +1,247 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from growth_model import stage_inputs
+from replay import READING_FIELDS
+from reward import DAMAGE_FIELDS, GROWTH_FIELDS, REWARD_FIELDS, compute_reward
+from species_batch import SpeciesBatch
+
+# Newline delimited JSON over a localhost TCP or Unix socket.
+# Request:  {"id": 1, "species": "Lavender", "day": 30, "conditions": {"light_intensity": 11000, ...}}
+#           conditions holds every replay.READING_FIELDS name, in Config units
+# Response: {"id": 1, "stage": 1, "f_light": ..., "RUE": ..., "growth": ..., "d_EC": ..., "damage": ...}
+#           or {"id": 1, "error": "..."}
+RESPONSE_FIELDS = GROWTH_FIELDS + ("RUE", "growth") + DAMAGE_FIELDS + ("damage",)
+RESPONSE_COLUMNS = [REWARD_FIELDS.index(name) for name in RESPONSE_FIELDS]
+DEFAULT_PORT = 8765
+
+
+def config_species(config_folder='Config', exclude_file='plant_temp.py'):
+    # Species name -> Config file name of every plant in config_folder
+    return {os.path.splitext(file)[0]: file for file in sorted(os.listdir(config_folder))
+            if file.endswith(".py") and file != exclude_file}
+
+
+class Predictor:
+    # Every species of config_folder compiled once into a SpeciesBatch, predict() scores a batch of mixed requests
+    # with one compute_reward call
+    def __init__(self, config_folder='Config', num_stages=5):
+        files = config_species(config_folder)
+        self.species = {name: i for i, name in enumerate(files)}
+        self.batch = SpeciesBatch(list(files.values()), num_stages, config_folder)
+
+    def predict(self, requests):
+        species = np.array([self.species[request["species"]] for request in requests])
+        day = np.minimum(np.array([request["day"] for request in requests]), self.batch.horizon - 1)
+        conditions = {name: np.array([float(request["conditions"][name]) for request in requests])
+                      for name in READING_FIELDS}
+        growth_inputs, damage_conditions = stage_inputs(conditions)
+        stage = self.batch.stage_index[species, day]
+        breakdown = np.empty((len(requests), len(REWARD_FIELDS)))
+        compute_reward(self.batch, self.batch.damage_engine, species * self.batch.n_stages + stage,
+                       self.batch.rue[species, day], growth_inputs, damage_conditions, out=breakdown)
+        values = breakdown[:, RESPONSE_COLUMNS].tolist()
+        return [dict(zip(RESPONSE_FIELDS, row), stage=int(s)) for row, s in zip(values, stage)]
+
+    def check(self, request):
+        # Error message for a request predict() can't score, None if it is valid
+        if not isinstance(request, dict):
+            return "a request must be a JSON object"
+        if request.get("species") not in self.species:
+            return f"unknown species {request.get('species')!r}, expected one of {sorted(self.species)}"
+        day = request.get("day")
+        if isinstance(day, bool) or not isinstance(day, int) or day < 0:
+            return "day must be a non-negative integer"
+        conditions = request.get("conditions")
+        if not isinstance(conditions, dict) or any(name not in conditions for name in READING_FIELDS):
+            return "conditions must hold " + ", ".join(READING_FIELDS)
+        for name in READING_FIELDS:
+            value = conditions[name]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                return f"conditions[{name!r}] must be a finite number"
+        return None
+
+
+class PredictionServer:
+    # Requests of every connection go through one queue. The batcher lets the readers run once (plus max_delay
+    # seconds if set), takes everything queued by then (at most max_batch) and scores it in a single
+    # Predictor.predict call, so batches grow with the load without holding back a lone request.
+    def __init__(self, predictor, max_batch=4096, max_delay=0.0):
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue = None
+        self.batches = 0
+        self.requests = 0
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+        self.queue = asyncio.Queue()
+        batcher = asyncio.create_task(self._batcher())
+        if path is not None:
+            server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            server = await asyncio.start_server(self._handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+    async def _handle(self, reader, writer):
+        pending = set()
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError as exc:
+                    # Not JSON, answered without an id and the connection stays open
+                    writer.write(_encode({"id": None, "error": f"invalid JSON: {exc}"}))
+                    continue
+                error = self.predictor.check(request)
+                if error is not None:
+                    request_id = request.get("id") if isinstance(request, dict) else None
+                    writer.write(_encode({"id": request_id, "error": error}))
+                    continue
+                future = asyncio.get_running_loop().create_future()
+                future.add_done_callback(lambda done, request_id=request.get("id"): writer.write(
+                    _encode(dict(done.result(), id=request_id))))
+                pending.add(future)
+                future.add_done_callback(pending.discard)
+                self.queue.put_nowait((request, future))
+            if pending:
+                await asyncio.wait(pending)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _batcher(self):
+        while True:
+            batch = [await self.queue.get()]
+            await asyncio.sleep(self.max_delay)
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                results = self.predictor.predict([request for request, _ in batch])
+            except Exception:
+                # Score the batch one by one, so only the offending requests get an error and the batcher keeps going
+                results = [self._predict_one(request) for request, _ in batch]
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            self.batches += 1
+            self.requests += len(batch)
+
+    def _predict_one(self, request):
+        try:
+            return self.predictor.predict([request])[0]
+        except Exception as error:
+            return {"error": f"prediction failed: {error}"}
+
+
+def _encode(message):
+    return (json.dumps(message) + "\n").encode()
+
+
+class PredictionClient:
+    # One connection with pipelined requests, predict() can be awaited from many tasks at once
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.futures = {}
+        self.next_id = 0
+        self.receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def predict(self, species, day, conditions):
+        if self.receiver.done():
+            raise ConnectionError("prediction server closed the connection")
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.futures[self.next_id] = future
+        self.writer.write(_encode({"id": self.next_id, "species": species, "day": day, "conditions": conditions}))
+        response = await future
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response
+
+    async def _receive(self):
+        try:
+            while line := await self.reader.readline():
+                response = json.loads(line)
+                future = self.futures.pop(response["id"], None)
+                if future is not None:
+                    future.set_result(response)
+        finally:
+            # Connection closed (or an unreadable response), nothing in flight will be answered
+            for future in self.futures.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("prediction server closed the connection"))
+            self.futures.clear()
+
+    async def close(self):
+        self.receiver.cancel()
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def run_load(n_clients=8, concurrency=32, duration=5.0, host="127.0.0.1", port=DEFAULT_PORT, path=None,
+                   config_folder='Config', seed=0):
+    # Local load generator: n_clients connections with concurrency requests in flight each, for duration seconds.
+    # Setpoints are random around every species' optimal conditions. Returns throughput and latency percentiles.
+    predictor = Predictor(config_folder)
+    names = list(predictor.species)
+    optimal = predictor.batch.optimal_conditions
+    rng = np.random.default_rng(seed)
+    latencies = []
+    stop = time.perf_counter() + duration
+
+    async def worker(client):
+        while time.perf_counter() < stop:
+            species = int(rng.integers(len(names)))
+            day = int(rng.integers(predictor.batch.lifetime[species]))
+            stage = predictor.batch.stage_index[species, day]
+            conditions = {name: float(optimal[name][species, stage] * rng.uniform(0.9, 1.1))
+                          for name in READING_FIELDS}
+            start = time.perf_counter()
+            await client.predict(names[species], day, conditions)
+            latencies.append(time.perf_counter() - start)
+
+    clients = [await PredictionClient.connect(host, port, path) for _ in range(n_clients)]
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(client) for client in clients for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    latencies = np.array(latencies)
+    return {"requests": len(latencies), "throughput": len(latencies) / elapsed,
+            "p50_ms": float(np.percentile(latencies, 50) * 1000), "p99_ms": float(np.percentile(latencies, 99) * 1000)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Growth model prediction service")
+    parser.add_argument("command", choices=["serve", "load"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="Unix socket path instead of TCP")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+    if args.command == "serve":
+        asyncio.run(PredictionServer(Predictor()).serve(args.host, args.port, args.unix))
+    else:
+        print(asyncio.run(run_load(args.clients, args.concurrency, args.duration, args.host, args.port, args.unix)))
@@ -0,0 +1,100 @@
+import os
+
+import numpy as np
+
+from reward import REWARD_FIELDS
+
+# Columns of a trajectory: the day number, the growth stage, the reward breakdown and the biomass after the day
+TRAJECTORY_FIELDS = ("day", "stage") + REWARD_FIELDS + ("biomass",)
+BREAKDOWN_COLUMNS = slice(2, 2 + len(REWARD_FIELDS))
+
+
+class TrajectoryRecorder:
+    # Per day rows written into a preallocated (capacity, field) float64 buffer.
+    # With a path (.csv or .npz) the buffer is flushed to disk every time it fills and on close(), without one it
+    # grows in memory and columns() returns everything recorded. Models take recorder=None to record nothing.
+    def __init__(self, path=None, capacity=4096):
+        if path is not None and os.path.splitext(path)[1] not in (".csv", ".npz"):
+            raise ValueError("Trajectory path must end with .csv or .npz")
+        self.path = path
+        self.fields = TRAJECTORY_FIELDS
+        self.rows = np.empty((capacity, len(self.fields)))
+        self.n_rows = 0
+        self.n_flushes = 0
+
+    def record(self, day, stage, breakdown, biomass):
+        if self.n_rows == len(self.rows):
+            self._make_room()
+        row = self.rows[self.n_rows]
+        row[0] = day
+        row[1] = stage
+        row[BREAKDOWN_COLUMNS] = breakdown
+        row[-1] = biomass
+        self.n_rows += 1
+
+    def record_rows(self, days, stages, breakdowns, biomass):
+        # Block version of record for (n,) days, stages and biomass and a (n, len(REWARD_FIELDS)) breakdown
+        # Fills the free rows of the buffer, making room whenever it is full (it may grow in between)
+        start = 0
+        while start < len(days):
+            if self.n_rows == len(self.rows):
+                self._make_room()
+            stop = min(start + len(self.rows) - self.n_rows, len(days))
+            rows = self.rows[self.n_rows:self.n_rows + stop - start]
+            rows[:, 0] = days[start:stop]
+            rows[:, 1] = stages[start:stop]
+            rows[:, BREAKDOWN_COLUMNS] = breakdowns[start:stop]
+            rows[:, -1] = biomass[start:stop]
+            self.n_rows += stop - start
+            start = stop
+
+    def _make_room(self):
+        if self.path is None:
+            self.rows = np.concatenate([self.rows, np.empty_like(self.rows)])
+        else:
+            self.flush()
+
+    def columns(self):
+        # Rows recorded since the last flush, as one array per field
+        return {name: self.rows[:self.n_rows, i].copy() for i, name in enumerate(self.fields)}
+
+    def flush(self):
+        if self.path is None or (self.n_rows == 0 and self.n_flushes > 0):
+            return
+        rows = self.rows[:self.n_rows]
+        if self.path.endswith(".csv"):
+            # The first flush replaces an existing file and writes the header
+            with open(self.path, "w" if self.n_flushes == 0 else "a") as f:
+                np.savetxt(f, rows, fmt="%.17g", delimiter=",",
+                           header=",".join(self.fields) if self.n_flushes == 0 else "", comments="")
+        else:
+            if self.n_flushes == 0:
+                # Parts of an earlier trajectory at the same path would be read back after ours
+                stale = 0
+                while os.path.exists(part_path(self.path, stale)):
+                    os.remove(part_path(self.path, stale))
+                    stale += 1
+            np.savez(part_path(self.path, self.n_flushes),
+                     **{name: rows[:, i] for i, name in enumerate(self.fields)})
+        self.n_flushes += 1
+        self.n_rows = 0
+
+    def close(self):
+        self.flush()
+
+
+def part_path(path, part):
+    # npz trajectories are written as one file per flush: run.npz -> run_00000.npz, run_00001.npz, ...
+    return f"{os.path.splitext(path)[0]}_{part:05d}.npz"
+
+
+def load_trajectory(path):
+    # Columns of a recorded .csv, or of every part of a recorded .npz, in recording order
+    if path.endswith(".csv"):
+        rows = np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2)
+        return {name: rows[:, i] for i, name in enumerate(TRAJECTORY_FIELDS)}
+    parts = []
+    while os.path.exists(part_path(path, len(parts))):
+        with np.load(part_path(path, len(parts))) as data:
+            parts.append({name: data[name] for name in TRAJECTORY_FIELDS})
+    return {name: np.concatenate([part[name] for part in parts]) for name in TRAJECTORY_FIELDS}
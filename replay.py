@@ -0,0 +1,86 @@
+import csv
+import itertools
+import warnings
+
+import numpy as np
+
+from growth_model import stage_inputs
+from reward import DAMAGE, GROWTH, REWARD_FIELDS, compute_reward
+from rollout import biomass_scan
+
+# Daily readings carry every OPTIMAL_CONDITIONS name except DLI, which the model derives from the light readings
+READING_FIELDS = ("light_intensity", "light_duration", "temperature", "RH", "PH", "EC", "water_duration",
+                  "water_cycles")
+READING_DTYPE = np.dtype([(name, np.float64) for name in READING_FIELDS])
+
+
+def dict_blocks(readings, block_days=4096):
+    # Groups an iterator of per day reading dicts into blocks of (n,) arrays
+    readings = iter(readings)
+    while True:
+        block = list(itertools.islice(readings, block_days))
+        if not block:
+            return
+        yield {name: np.array([reading[name] for reading in block], dtype=np.float64) for name in READING_FIELDS}
+
+
+def csv_blocks(path, block_days=4096, columns=None):
+    # Streams a CSV log with a header row, columns maps log column names to READING_FIELDS names
+    columns = columns or {}
+    with open(path, newline="") as f:
+        header = next(csv.reader([f.readline()]))
+        names = [columns.get(name.strip(), name.strip()) for name in header]
+        used = [names.index(name) for name in READING_FIELDS]
+        while True:
+            with warnings.catch_warnings():
+                # loadtxt warns when it reaches the end of the file
+                warnings.simplefilter("ignore", UserWarning)
+                rows = np.loadtxt(f, delimiter=",", max_rows=block_days, ndmin=2, usecols=used)
+            if len(rows) == 0:
+                return
+            yield {name: rows[:, i] for i, name in enumerate(READING_FIELDS)}
+
+
+def memmap_blocks(path, block_days=65536):
+    # Streams a binary log of READING_DTYPE records (e.g. written with array.astype(READING_DTYPE).tofile(path)),
+    # pages are mapped on demand so only the current block is resident
+    log = np.memmap(path, dtype=READING_DTYPE, mode="r")
+    for start in range(0, len(log), block_days):
+        block = np.array(log[start:start + block_days])
+        yield {name: block[name] for name in READING_FIELDS}
+
+
+def to_model_units(blocks, scales=None, offsets=None):
+    # reading * scale + offset per field, for logs that are not in the units of Config/*.py
+    scales = scales or {}
+    offsets = offsets or {}
+    for block in blocks:
+        yield {name: values * scales.get(name, 1.0) + offsets.get(name, 0.0) for name, values in block.items()}
+
+
+def replay(model, blocks):
+    # Runs a GrowthModel over a stream of daily reading blocks and yields one prediction block per input block.
+    # A bay is replanted every LIFETIME days: day counts 1..LIFETIME within a crop and biomass restarts at 0.
+    # Only the current block and the carried biomass are held, memory does not grow with the length of the log.
+    profile = model.profile
+    lifetime = model.lifetime
+    day = 0
+    biomass = 0.0
+    for block in blocks:
+        n_days = len(block[READING_FIELDS[0]])
+        growth_inputs, damage_conditions = stage_inputs(block)
+        crops, days = np.divmod(day + np.arange(n_days), lifetime)
+        stage = profile.stage_for_days(days)
+        breakdown = np.empty((n_days, len(REWARD_FIELDS)))
+        compute_reward(profile, model.damage_engine, stage, profile.rue_for_days(days), growth_inputs,
+                       damage_conditions, out=breakdown)
+        growth = breakdown[:, GROWTH]
+        retained = 1 - model.damage_sensitivity * breakdown[:, DAMAGE]
+
+        # Nothing is carried into the first day of a crop, the block continues the biomass of the previous one
+        retained[days == 0] = 0.0
+        prediction = biomass_scan(growth, retained, biomass)
+        biomass = prediction[-1]
+        day += n_days
+        yield {"crop": crops, "day": days + 1, "stage": stage, "growth": growth,
+               "damage_factor": breakdown[:, DAMAGE], "biomass": prediction}
@@ -0,0 +1,50 @@
+import numpy as np
+
+from plant_profile import DAMAGE_FACTORS
+
+# Columns of the reward breakdown, growth factors are in plant_profile.GROWTH_FACTORS order
+GROWTH_FIELDS = ("f_light", "f_temp", "f_ph", "f_ec", "f_rh", "f_water_duration", "f_n_cycles")
+DAMAGE_FIELDS = tuple("d_" + name for name in DAMAGE_FACTORS)
+REWARD_FIELDS = GROWTH_FIELDS + ("RUE", "growth") + DAMAGE_FIELDS + ("damage", "reward")
+
+GROWTH_TERMS = slice(0, len(GROWTH_FIELDS))
+RUE = REWARD_FIELDS.index("RUE")
+GROWTH = REWARD_FIELDS.index("growth")
+DAMAGE_TERMS = slice(GROWTH + 1, GROWTH + 1 + len(DAMAGE_FIELDS))
+DAMAGE = REWARD_FIELDS.index("damage")
+REWARD = REWARD_FIELDS.index("reward")
+
+
+def factor_function(x_optimal, x, sigma_x):
+    return np.exp(-((x - x_optimal) ** 2) / (2 * (sigma_x) ** 2))
+
+
+def compute_reward(profile, damage_engine, stage, rue, growth_inputs, damage_conditions, out):
+    # Evaluates every growth factor, damage term and the reward once and writes them into out (..., len(REWARD_FIELDS)).
+    # growth_inputs and damage_conditions are (..., 7) in GROWTH_FACTORS / DAMAGE_FACTORS order.
+    out[..., GROWTH_TERMS] = factor_function(profile.growth_optimal[stage], np.asarray(growth_inputs),
+                                             profile.growth_sigma[stage])
+    out[..., RUE] = rue
+    out[..., DAMAGE_TERMS] = damage_engine.terms(stage, damage_conditions)
+    return finish_reward(out)
+
+
+def finish_reward(out):
+    # Growth, damage and reward from the factor, RUE and damage term columns, multiplied and summed in model order
+    f = out[..., GROWTH_TERMS]
+    growth = out[..., RUE]
+    for i in range(f.shape[-1]):
+        growth = growth * f[..., i]
+    out[..., GROWTH] = growth
+
+    terms = out[..., DAMAGE_TERMS]
+    damage = terms[..., 0]
+    for i in range(1, terms.shape[-1]):
+        damage = damage + terms[..., i]
+    out[..., DAMAGE] = damage
+
+    damage = out[..., DAMAGE]
+    growth = out[..., GROWTH]
+    with np.errstate(invalid="ignore"):
+        out[..., REWARD] = np.where(damage != 0, growth - damage * growth, growth)
+    return out
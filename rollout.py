@@ -0,0 +1,90 @@
+import numpy as np
+
+from action_tables import damage_conditions, decode_actions, growth_inputs
+from reward import DAMAGE, GROWTH, REWARD, REWARD_FIELDS, RUE, compute_reward, finish_reward
+
+
+def biomass_scan(growth, retained, initial=0.0):
+    # Solves b[t] = b[t-1] * retained[t] + growth[t] from b[-1] = initial along the last axis without a Python loop
+    # over days.
+    # Every day is the affine map b -> b * retained + growth, their prefix composition is built by doubling
+    # (log2(T) array passes, no divisions so days with total loss or negative retention stay exact).
+    a = np.array(retained, dtype=np.float64)
+    b = np.array(growth, dtype=np.float64)
+    n_days = a.shape[-1]
+    shift = 1
+    with np.errstate(invalid="ignore", over="ignore"):
+        # Day 0 becomes the constant map to its biomass, its retention is never read again
+        b[..., 0] = initial * a[..., 0] + b[..., 0]
+        while shift < n_days:
+            b[..., shift:] = b[..., :-shift] * a[..., shift:] + b[..., shift:]
+            a[..., shift:] = a[..., :-shift] * a[..., shift:]
+            shift *= 2
+    return b
+
+
+def simulate_schedule(profile, damage_engine, actions, action_tables=None, decode=False):
+    # Scores a whole schedule of HydroponicEnv actions, (T, 8) or (B, T, 8), as if stepped from reset().
+    # Day t of the schedule is step t + 1. Rewards match HydroponicEnv.step, biomass follows the Simulator
+    # update b' = b * (1 - DAMAGE_SENSITIVITY * D) + growth. decode scores the decode_actions values (Config plants).
+    actions = np.asarray(actions, dtype=np.int64)
+    n_days = actions.shape[-2]
+    steps = np.arange(1, n_days + 1)
+    stage = profile.stage_for_days(steps)
+    rue = profile.rue_for_days(steps)
+    stage = np.broadcast_to(stage, actions.shape[:-1])
+    rue = np.broadcast_to(rue, actions.shape[:-1])
+
+    breakdown = np.empty(actions.shape[:-1] + (len(REWARD_FIELDS),))
+    if action_tables is not None:
+        action_tables.compute_reward(stage, rue, actions, out=breakdown)
+    else:
+        values = decode_actions(actions) if decode else actions
+        compute_reward(profile, damage_engine, stage, rue, growth_inputs(values), damage_conditions(values),
+                       out=breakdown)
+
+    return _daily_biomass(profile, breakdown)
+
+
+def hold_action(profile, damage_engine, action, first_step, n_days, action_tables=None, initial_biomass=0.0,
+                decode=False):
+    # One action (..., 8) held for the n_days days after first_step (the current step, scalar or (...)).
+    # Growth factors and damage terms only change at stage boundaries, so they are evaluated once per stage the
+    # days cover and only RUE is filled in per day. The (..., n_days) arrays equal those of n_days single steps.
+    action = np.asarray(action, dtype=np.int64)
+    steps = np.asarray(first_step)[..., None] + np.arange(1, n_days + 1)
+    stage = profile.stage_for_days(steps)
+    stages = np.arange(stage.min(), stage.max() + 1)
+
+    held = action[..., None, :]
+    per_stage = np.empty(action.shape[:-1] + (len(stages), len(REWARD_FIELDS)))
+    if action_tables is not None:
+        action_tables.compute_reward(stages, 1.0, held, out=per_stage)
+    else:
+        values = decode_actions(held) if decode else held
+        compute_reward(profile, damage_engine, stages, 1.0, growth_inputs(values), damage_conditions(values),
+                       out=per_stage)
+
+    breakdown = np.take_along_axis(per_stage, (stage - stages[0])[..., None], axis=-2)
+    breakdown[..., RUE] = profile.rue_for_days(steps)
+    finish_reward(breakdown)
+    return _daily_biomass(profile, breakdown, initial_biomass)
+
+
+def _daily_biomass(profile, breakdown, initial_biomass=0.0):
+    growth = breakdown[..., GROWTH]
+    damage_factor = breakdown[..., DAMAGE]
+    retained = 1 - profile.damage_sensitivity * damage_factor
+    biomass = biomass_scan(growth, retained, initial_biomass)
+    initial = np.broadcast_to(initial_biomass, biomass.shape[:-1])[..., None]
+    previous = np.concatenate([initial, biomass[..., :-1]], axis=-1)
+    with np.errstate(invalid="ignore"):
+        damage = damage_factor * previous * profile.damage_sensitivity
+    return {
+        "biomass": biomass,
+        "growth": growth,
+        "damage": damage,
+        "damage_factor": damage_factor,
+        "reward": breakdown[..., REWARD],
+        "reward_breakdown": breakdown,
+    }
@@ -0,0 +1,90 @@
+import numpy as np
+
+from damage import DamageEngine
+from growth_model import stage_inputs
+from plant_config import CONDITION_NAMES, DAMAGE_FACTORS, GROWTH_FACTORS, NUM_STAGES
+from plant_profile import growth_stage_durations
+from reward import DAMAGE, GROWTH, REWARD_FIELDS, compute_reward
+from rollout import biomass_scan
+from species_catalog import SpeciesCatalog
+
+
+class SpeciesBatch:
+    # Every species of a greenhouse stacked into struct-of-arrays tables, one simulation pass covers rows of mixed
+    # species. Stage indexed arrays are flattened to (species * n_stages + stage, ...), so compute_reward and
+    # DamageEngine take this object in place of a PlantProfile and gather every row's species and stage at once.
+    # plants is a SpeciesCatalog or a list of Config modules or file names in config_folder, a row's species is its
+    # index in it. The tables are built from the catalog arrays without a per-species loop.
+    def __init__(self, plants, num_stages=5, config_folder='Config'):
+        catalog = plants if isinstance(plants, SpeciesCatalog) else SpeciesCatalog.from_plants(plants, config_folder)
+        arrays = catalog.arrays
+        self.catalog = catalog
+        self.n_species = len(catalog)
+        self.n_stages = NUM_STAGES
+
+        # (species,) parameters
+        self.max_biomass = arrays["MAX_BIOMASS"]
+        self.lifetime = arrays["LIFETIME"]
+        self.K = arrays["K"]
+        self.A = arrays["A"]
+        self.damage_sensitivity = arrays["DAMAGE_SENSITIVITY"]
+
+        # (species, day) tables up to the longest lifetime, zero RUE after a species' own lifetime. The RUE curve is
+        # PlantProfile's, normalised over days 0..LIFETIME (a sequential cumsum, summed in the same order)
+        self.horizon = int(self.lifetime.max())
+        days = np.arange(self.horizon)
+        curve = np.exp(-((np.arange(self.horizon + 1) - self.K[:, None]) ** 2) / (2 * self.A[:, None] ** 2))
+        rue_max = self.max_biomass / np.cumsum(curve, axis=1)[np.arange(self.n_species), self.lifetime]
+        self.rue = np.where(days < self.lifetime[:, None], rue_max[:, None] * curve[:, :self.horizon], 0.0)
+        durations = {lifetime: growth_stage_durations(lifetime, num_stages)
+                     for lifetime in np.unique(self.lifetime).tolist()}
+        stage_durations = np.where(arrays["MANUAL_STAGES"][:, None], arrays["NUMBER_OF_DAYS_PER_STAGE"], 0)
+        automatic = ~arrays["MANUAL_STAGES"]
+        stage_durations[automatic, :num_stages] = [durations[lifetime]
+                                                   for lifetime in self.lifetime[automatic].tolist()]
+        stage_ends = np.cumsum(stage_durations, axis=1)
+        last_stage = np.where(arrays["MANUAL_STAGES"], NUM_STAGES, num_stages) - 1
+        self.stage_index = np.minimum((days >= stage_ends[:, :, None]).sum(axis=1), last_stage[:, None])
+
+        # (species * stage, ...) tables in the PlantProfile layout
+        optimal = dict(zip(CONDITION_NAMES, arrays["OPTIMAL_CONDITIONS"].transpose(1, 0, 2)))
+        optimal["TWD"] = optimal["water_duration"] * optimal["water_cycles"]
+        self.growth_optimal = np.stack([optimal[name] for name in GROWTH_FACTORS], axis=2).reshape(
+            -1, len(GROWTH_FACTORS))
+        self.growth_sigma = arrays["GROWTH_SIGMAS"].transpose(0, 2, 1).reshape(-1, len(GROWTH_FACTORS))
+        self.damage_optimal = np.stack([optimal[name] for name in DAMAGE_FACTORS], axis=2).reshape(
+            -1, len(DAMAGE_FACTORS))
+        self.low_parameters = arrays["LOW_PARAMETERS"].transpose(0, 2, 1, 3).reshape(-1, len(DAMAGE_FACTORS), 3)
+        self.high_parameters = arrays["HIGH_PARAMETERS"].transpose(0, 2, 1, 3).reshape(-1, len(DAMAGE_FACTORS), 3)
+        self.damage_engine = DamageEngine(self)
+
+        # (species, stage) OPTIMAL_CONDITIONS of every species
+        self.optimal_conditions = {name: optimal[name] for name in CONDITION_NAMES}
+
+    def row_conditions(self, species):
+        # (row, stage) conditions dict holding every row's own OPTIMAL_CONDITIONS
+        return {name: values[species] for name, values in self.optimal_conditions.items()}
+
+    def run(self, species, conditions=None):
+        # Daily biomass of every row, (rows, horizon). species is (rows,) indices into plants, conditions a dict of
+        # (rows, stage) arrays (the rows' OPTIMAL_CONDITIONS by default). A row stops growing after its own
+        # LIFETIME and keeps its final biomass, so curve[:, -1] is every row's biomass at the end of its lifetime.
+        species = np.asarray(species, dtype=np.int64)
+        if conditions is None:
+            conditions = self.row_conditions(species)
+        growth_inputs, damage_conditions = stage_inputs(conditions)
+        stages = species[:, None] * self.n_stages + np.arange(self.n_stages)
+        per_stage = np.empty(stages.shape + (len(REWARD_FIELDS),))
+        compute_reward(self, self.damage_engine, stages, 1.0, growth_inputs[:, :self.n_stages],
+                       damage_conditions[:, :self.n_stages], out=per_stage)
+
+        # Gathered per row and day, days past a row's lifetime keep the biomass (growth 0, nothing lost)
+        stage = self.stage_index[species]
+        alive = np.arange(self.horizon) < self.lifetime[species][:, None]
+        growth = np.take_along_axis(per_stage[..., GROWTH], stage, axis=1) * self.rue[species]
+        damage_factor = np.take_along_axis(per_stage[..., DAMAGE], stage, axis=1)
+        retained = np.where(alive, 1 - self.damage_sensitivity[species][:, None] * damage_factor, 1.0)
+        biomass = biomass_scan(growth, retained)
+        # The scan groups days past the lifetime differently, the final biomass is copied to stay bit-identical
+        final = np.take_along_axis(biomass, self.lifetime[species][:, None] - 1, axis=1)
+        return np.where(alive, biomass, final)
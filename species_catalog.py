@@ -0,0 +1,142 @@
+import json
+import os
+
+import numpy as np
+
+from plant_config import (CONDITION_NAMES, DAMAGE_FACTORS, DEFAULTS, GROWTH_FACTORS, NUM_STAGES, SCALARS,
+                          CompiledPlant, load_plant_config, plant_data)
+
+# Array layout of a catalog, row i of every array is species names[i]:
+#   MAX_BIOMASS, K, A, DAMAGE_SENSITIVITY (species,)  LIFETIME (species,) int  MANUAL_STAGES (species,) bool
+#   NUMBER_OF_DAYS_PER_STAGE (species, stage) int
+#   OPTIMAL_CONDITIONS (species, CONDITION_NAMES, stage)  GROWTH_SIGMAS (species, GROWTH_FACTORS, stage)
+#   LOW_PARAMETERS, HIGH_PARAMETERS (species, DAMAGE_FACTORS, stage, [critical, limit, gamma])
+CATALOG_SHAPES = {
+    "MAX_BIOMASS": (), "LIFETIME": (), "K": (), "A": (), "DAMAGE_SENSITIVITY": (), "MANUAL_STAGES": (),
+    "NUMBER_OF_DAYS_PER_STAGE": (NUM_STAGES,),
+    "OPTIMAL_CONDITIONS": (len(CONDITION_NAMES), NUM_STAGES),
+    "GROWTH_SIGMAS": (len(GROWTH_FACTORS), NUM_STAGES),
+    "LOW_PARAMETERS": (len(DAMAGE_FACTORS), NUM_STAGES, 3),
+    "HIGH_PARAMETERS": (len(DAMAGE_FACTORS), NUM_STAGES, 3),
+}
+TABLE_NAMES = {"OPTIMAL_CONDITIONS": CONDITION_NAMES, "GROWTH_SIGMAS": GROWTH_FACTORS,
+               "LOW_PARAMETERS": DAMAGE_FACTORS, "HIGH_PARAMETERS": DAMAGE_FACTORS}
+
+
+def catalog_problems(names, arrays):
+    # The plant_config.config_problems rules checked over every species at once
+    problems = []
+    n_species = len(names)
+    for key, shape in CATALOG_SHAPES.items():
+        if key not in arrays:
+            problems.append(f"{key} is missing")
+        elif not (np.issubdtype(arrays[key].dtype, np.number) or arrays[key].dtype == bool):
+            problems.append(f"{key} must be numeric, got {arrays[key].dtype}")
+        elif arrays[key].shape != (n_species,) + shape:
+            problems.append(f"{key} must have shape {(n_species,) + shape}, got {arrays[key].shape}")
+    if problems:
+        return problems
+
+    def check(valid, message):
+        invalid = ~np.asarray(valid)
+        if invalid.ndim > 1:
+            invalid = invalid.reshape(n_species, -1).any(axis=1)
+        if invalid.any():
+            failing = [names[i] for i in np.flatnonzero(invalid)]
+            more = f" and {len(failing) - 5} more" if len(failing) > 5 else ""
+            problems.append(f"{message} ({', '.join(failing[:5])}{more})")
+
+    lifetime = arrays["LIFETIME"]
+    check(arrays["MAX_BIOMASS"] > 0, "MAX_BIOMASS must be positive")
+    check((lifetime >= 1) & (lifetime == np.floor(lifetime)), "LIFETIME must be a positive whole number of days")
+    check(arrays["A"] != 0, "A must not be 0")
+    check(arrays["DAMAGE_SENSITIVITY"] >= 0, "DAMAGE_SENSITIVITY must not be negative")
+    check(~arrays["MANUAL_STAGES"].astype(bool) | (arrays["NUMBER_OF_DAYS_PER_STAGE"].sum(axis=1) == lifetime),
+          "NUMBER_OF_DAYS_PER_STAGE must sum to LIFETIME")
+    check(arrays["GROWTH_SIGMAS"] > 0, "GROWTH_SIGMAS must be positive")
+    low, high = arrays["LOW_PARAMETERS"], arrays["HIGH_PARAMETERS"]
+    check(low[..., 0] > low[..., 1], "LOW_PARAMETERS: critical low must be above the minimum")
+    check(high[..., 0] < high[..., 1], "HIGH_PARAMETERS: critical high must be below the maximum")
+    return problems
+
+
+class SpeciesCatalog:
+    # Any number of species as stacked arrays in the CATALOG_SHAPES layout, validated as a whole on construction.
+    # SpeciesBatch takes one in place of a list of plants. Catalogs are read from plant_config JSON files or from a
+    # single packed .npz, neither executes code.
+    def __init__(self, names, arrays):
+        self.names = [str(name) for name in names]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        if len(self.index) != len(self.names):
+            raise ValueError("Invalid catalog: species names must be unique")
+        problems = catalog_problems(self.names, arrays)
+        if problems:
+            raise ValueError("Invalid catalog: " + "; ".join(problems))
+        self.arrays = {key: np.asarray(arrays[key], dtype=np.float64) for key in CATALOG_SHAPES}
+        for key, dtype in (("LIFETIME", np.int64), ("MANUAL_STAGES", bool), ("NUMBER_OF_DAYS_PER_STAGE", np.int64)):
+            self.arrays[key] = arrays[key].astype(dtype)
+
+    def __len__(self):
+        return len(self.names)
+
+    def plant(self, species):
+        # CompiledPlant of one species, by name or row index
+        i = self.index[species] if isinstance(species, str) else int(species)
+        arrays = {key: values[i] for key, values in self.arrays.items() if key in SCALARS}
+        arrays["NUMBER_OF_DAYS_PER_STAGE"] = self.arrays["NUMBER_OF_DAYS_PER_STAGE"][i]
+        for table, names in TABLE_NAMES.items():
+            arrays.update((f"{table}.{name}", values) for name, values in zip(names, self.arrays[table][i]))
+        return CompiledPlant(self.names[i], arrays)
+
+    @classmethod
+    def from_data(cls, names, rows):
+        # Catalog of plant_data dicts, filled row by row into preallocated arrays
+        names = list(names)
+        arrays = {key: np.zeros((len(names),) + shape) for key, shape in CATALOG_SHAPES.items()}
+        arrays["MANUAL_STAGES"] = np.zeros(len(names), dtype=bool)
+        for i, (name, data) in enumerate(zip(names, rows)):
+            try:
+                for key in CATALOG_SHAPES:
+                    if key in TABLE_NAMES:
+                        arrays[key][i] = [data[key][factor] for factor in TABLE_NAMES[key]]
+                    else:
+                        arrays[key][i] = data.get(key, DEFAULTS[key]) if key in DEFAULTS else data[key]
+            except (KeyError, TypeError, ValueError) as error:
+                raise ValueError(f"Invalid config {name}: missing or malformed {error}") from None
+        return cls(names, arrays)
+
+    @classmethod
+    def from_plants(cls, plants, config_folder='Config'):
+        # Catalog of Config modules, CompiledPlants or file names in config_folder
+        plants = [load_plant_config(plant, config_folder) if isinstance(plant, str) else plant for plant in plants]
+        return cls.from_data([plant.__name__ for plant in plants], [plant_data(plant) for plant in plants])
+
+    @classmethod
+    def read_json(cls, paths):
+        # One pass over plant_config JSON files, species are named after the files
+        paths = list(paths)
+        names = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+        return cls.from_data(names, (_read_json(path) for path in paths))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as packed:
+            arrays = {key: packed[key] for key in packed.files if key != "names"}
+            return cls(packed["names"].tolist(), arrays)
+
+    def save(self, path):
+        # Packs the catalog into one .npz, the fastest to load back
+        np.savez(path, names=np.array(self.names), **self.arrays)
+
+
+def _read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_catalog(source):
+    # SpeciesCatalog of a packed .npz file or of every .json config in a folder
+    if os.path.isdir(source):
+        return SpeciesCatalog.read_json(os.path.join(source, file_name) for file_name in sorted(os.listdir(source))
+                                        if file_name.endswith(".json"))
+    return SpeciesCatalog.load(source)
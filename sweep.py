@@ -0,0 +1,152 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from growth_model import GrowthModel
+
+# A swept key is a condition name (same value in every stage) or a (name, stage) pair,
+# e.g. GridDesign(plant.OPTIMAL_CONDITIONS, {"temperature": range(15, 35), ("EC", 0): np.linspace(1, 4, 31)})
+MANIFEST_FILE = "sweep.json"
+
+
+def column_name(key):
+    return key if isinstance(key, str) else f"{key[0]}_{key[1]}"
+
+
+def design_conditions(base_conditions, values, n_points):
+    # Conditions dict of (n_points, stage) arrays: base_conditions with the swept values written in
+    conditions = {name: np.repeat(np.asarray(stage_values, dtype=np.float64)[None], n_points, axis=0)
+                  for name, stage_values in base_conditions.items()}
+    for key, column in values.items():
+        if isinstance(key, str):
+            conditions[key][:] = column[:, None]
+        else:
+            name, stage = key
+            conditions[name][:, stage] = column
+    return conditions
+
+
+def _base_manifest(base_conditions):
+    return {name: np.asarray(stage_values, dtype=np.float64).tolist() for name, stage_values in base_conditions.items()}
+
+
+class GridDesign:
+    # Cartesian product of the values of every swept key. Points are generated per chunk from their flat index,
+    # the grid itself is never built.
+    def __init__(self, base_conditions, axes):
+        self.base_conditions = base_conditions
+        self.keys = list(axes)
+        self.axes = [np.asarray(values, dtype=np.float64) for values in axes.values()]
+        self.shape = tuple(len(values) for values in self.axes)
+        self.n_points = int(np.prod(self.shape))
+
+    def values(self, start, stop):
+        index = np.unravel_index(np.arange(start, stop), self.shape)
+        return {key: axis[i] for key, axis, i in zip(self.keys, self.axes, index)}
+
+    def manifest(self):
+        return {"grid": {column_name(key): axis.tolist() for key, axis in zip(self.keys, self.axes)},
+                "base_conditions": _base_manifest(self.base_conditions)}
+
+
+class RandomDesign:
+    # n_points uniform samples of every swept key in its (low, high) range. Each chunk draws from its own seed,
+    # so a chunk is the same whichever worker runs it and whenever a sweep is resumed.
+    def __init__(self, base_conditions, ranges, n_points, seed=0):
+        self.base_conditions = base_conditions
+        self.keys = list(ranges)
+        self.ranges = [tuple(float(bound) for bound in bounds) for bounds in ranges.values()]
+        self.n_points = n_points
+        self.seed = seed
+
+    def values(self, start, stop):
+        rng = np.random.default_rng([self.seed, start])
+        return {key: rng.uniform(low, high, stop - start) for key, (low, high) in zip(self.keys, self.ranges)}
+
+    def manifest(self):
+        return {"random": {column_name(key): list(bounds) for key, bounds in zip(self.keys, self.ranges)},
+                "n_points": self.n_points, "seed": self.seed, "base_conditions": _base_manifest(self.base_conditions)}
+
+
+# One GrowthModel and design per worker process, built once by the pool initializer
+_worker = {}
+
+
+def _init_worker(plant, num_stages, config_folder, design, store_curves):
+    _worker["model"] = GrowthModel(plant, num_stages, config_folder=config_folder)
+    _worker["design"] = design
+    _worker["store_curves"] = store_curves
+
+
+def _run_chunk(start, stop, path):
+    design = _worker["design"]
+    values = design.values(start, stop)
+    curves = _worker["model"].run_lifetime(design_conditions(design.base_conditions, values, stop - start))
+    columns = {column_name(key): column for key, column in values.items()}
+    columns["index"] = np.arange(start, stop)
+    columns["final_biomass"] = curves[:, -1]
+    columns["peak_biomass"] = curves.max(axis=1)
+    if _worker["store_curves"]:
+        columns["biomass"] = curves.astype(np.float32)
+    # Written under a temporary name and renamed, a chunk file on disk is always complete
+    temporary = path[:-len(".npz")] + ".partial.npz"
+    np.savez(temporary, **columns)
+    os.replace(temporary, path)
+    return stop - start
+
+
+def chunk_path(out_dir, chunk):
+    return os.path.join(out_dir, f"chunk_{chunk:06d}.npz")
+
+
+def run_sweep(plant, design, out_dir, chunk_size=50000, workers=None, num_stages=5, config_folder='Config',
+              store_curves=False, progress=None):
+    # Runs every point of design through GrowthModel.run_lifetime on a process pool, one chunk_size batch per task.
+    # plant is the file name of a Config/*.py. Every chunk is written to out_dir as its own npz (swept columns,
+    # index, final_biomass, peak_biomass and the float32 biomass curves with store_curves). Chunks already on disk
+    # are skipped, so an interrupted sweep resumes by calling run_sweep again with the same arguments.
+    # progress(done_points, n_points) is called after every chunk.
+    manifest = {"plant": plant, "num_stages": num_stages, "chunk_size": chunk_size, "store_curves": store_curves,
+                "n_points": design.n_points, "design": design.manifest()}
+    manifest = json.loads(json.dumps(manifest))
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if json.load(f) != manifest:
+                raise ValueError(f"{out_dir} holds a different sweep, use a new out_dir.")
+    else:
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f)
+
+    chunks = [(start, min(start + chunk_size, design.n_points), chunk_path(out_dir, chunk))
+              for chunk, start in enumerate(range(0, design.n_points, chunk_size))]
+    pending = [chunk for chunk in chunks if not os.path.exists(chunk[2])]
+    done = design.n_points - sum(stop - start for start, stop, _ in pending)
+    if progress is not None:
+        progress(done, design.n_points)
+    if not pending:
+        return [path for _, _, path in chunks]
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(plant, num_stages, config_folder, design, store_curves)) as pool:
+        futures = [pool.submit(_run_chunk, *chunk) for chunk in pending]
+        for future in as_completed(futures):
+            done += future.result()
+            if progress is not None:
+                progress(done, design.n_points)
+    return [path for _, _, path in chunks]
+
+
+def load_sweep(out_dir):
+    # Every column of a finished sweep concatenated in point order
+    with open(os.path.join(out_dir, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    n_chunks = -(-manifest["n_points"] // manifest["chunk_size"])
+    parts = []
+    for chunk in range(n_chunks):
+        with np.load(chunk_path(out_dir, chunk)) as data:
+            parts.append({name: data[name] for name in data.files})
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
@@ -0,0 +1,44 @@
+import pickle
+
+import numpy as np
+
+from env_factory import make_async_vector_env
+from gym_env import HydroponicEnv
+
+
+def _check_batch(obs, space, n_envs):
+    # Observations are a Dict space, every entry is batched along a leading env axis
+    assert set(obs) == set(space.spaces)
+    for name, values in obs.items():
+        assert values.shape == (n_envs,) + space[name].shape
+
+
+def test_async_vector_env():
+    envs = make_async_vector_env(2, seed=0, context="spawn")
+    try:
+        obs, _ = envs.reset(seed=0)
+        _check_batch(obs, envs.single_observation_space, 2)
+        obs, reward, terminated, truncated, info = envs.step(envs.action_space.sample())
+        _check_batch(obs, envs.single_observation_space, 2)
+        assert reward.shape == terminated.shape == truncated.shape == (2,)
+        assert info["reward_breakdown"].shape[0] == 2
+    finally:
+        envs.close()
+
+
+def test_pickle_after_render():
+    env = HydroponicEnv(render_mode="rgb_array")
+    env.reset(seed=0)
+    env.action_space.seed(0)
+    env.step(env.action_space.sample())
+    frame = env.render()
+    assert frame.ndim == 3 and frame.shape[2] == 3
+
+    clone = pickle.loads(pickle.dumps(env))
+    assert clone._observation() == env._observation()
+    action = env.action_space.sample()
+    # Rewards of the env plant can be nan, assert_equal treats nan as equal to itself
+    np.testing.assert_equal(clone.step(action)[:2], env.step(action)[:2])
+    assert clone.render().shape == frame.shape
+    env.close()
+    clone.close()
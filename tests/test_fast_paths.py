@@ -0,0 +1,153 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from action_tables import ACTION_NVEC
+from growth_model import GrowthModel
+from gym_env import HydroponicEnv
+from plant_config import load_plant_config
+from rollout import biomass_scan
+from vector_env import HydroponicVectorEnv
+
+# Every vectorised path against the day by day loop it replaces, on fixed seeds. Env rewards are compared exactly
+# (nan included, the env plant's damage overflows), growth model curves to a few ulps.
+PLANTS = ["Lavender.py", "Lattuse.py", "Aloe Vera.py"]
+
+
+def random_actions(rng, shape):
+    return rng.integers(0, ACTION_NVEC, size=shape + (len(ACTION_NVEC),))
+
+
+def test_biomass_scan_matches_loop():
+    rng = np.random.default_rng(0)
+    growth = rng.random((4, 500))
+    retained = rng.random((4, 500)) * 1.2 - 0.1
+    retained[:, ::37] = 0.0
+    expected = np.empty_like(growth)
+    biomass = np.full(4, 2.5)
+    for day in range(growth.shape[1]):
+        biomass = biomass * retained[:, day] + growth[:, day]
+        expected[:, day] = biomass
+    np.testing.assert_allclose(biomass_scan(growth, retained, 2.5), expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize("plant_config", [None, "Lavender.py"])
+def test_lookup_tables_match_direct_evaluation(plant_config):
+    rng = np.random.default_rng(1)
+    direct = HydroponicEnv(plant_config=plant_config)
+    tables = HydroponicEnv(plant_config=plant_config, lookup_tables=True)
+    direct.reset()
+    tables.reset()
+    for action in random_actions(rng, (200,)):
+        expected = direct.step(action)
+        result = tables.step(action)
+        np.testing.assert_array_equal(result[4]["reward_breakdown"], expected[4]["reward_breakdown"])
+        np.testing.assert_equal(result[:4], expected[:4])
+
+
+@pytest.mark.parametrize("lookup_tables", [False, True])
+def test_simulate_schedule_matches_steps(lookup_tables):
+    rng = np.random.default_rng(2)
+    env = HydroponicEnv(lookup_tables=lookup_tables)
+    actions = random_actions(rng, (3, 60))
+    schedule = env.simulate_schedule(actions)
+    for row, schedule_rewards in zip(actions, schedule["reward"]):
+        env.reset()
+        np.testing.assert_array_equal([env.step(action)[1] for action in row], schedule_rewards)
+
+
+@pytest.mark.parametrize("plant_config", [None, "Lavender.py"])
+@pytest.mark.parametrize("action_repeat", [1, 7])
+def test_repeat_and_vector_env_match_single_steps(plant_config, action_repeat):
+    rng = np.random.default_rng(3)
+    episode_length = 40
+    single = HydroponicEnv(plant_config=plant_config, episode_length=episode_length)
+    repeat = HydroponicEnv(plant_config=plant_config, episode_length=episode_length, action_repeat=action_repeat)
+    vector = HydroponicVectorEnv(2, episode_length=episode_length, plant_config=plant_config,
+                                 action_repeat=action_repeat)
+    single.reset()
+    repeat.reset()
+    vector.reset()
+    for action in random_actions(rng, (episode_length,)):
+        observation, reward, terminated, _, info = repeat.step(action)
+        total = 0.0
+        for _ in range(action_repeat):
+            single_observation, single_reward, single_terminated, _, single_info = single.step(action)
+            total = total + single_reward
+            if single_terminated:
+                break
+        np.testing.assert_equal((observation, reward, terminated), (single_observation, total, single_terminated))
+        np.testing.assert_array_equal(info["reward_breakdown"], single_info["reward_breakdown"])
+
+        vector_observation, vector_reward, vector_terminated, _, _ = vector.step(np.tile(action, (2, 1)))
+        np.testing.assert_array_equal(vector_reward, [reward, reward])
+        assert vector_terminated.tolist() == [terminated, terminated]
+        assert all(vector_observation[key][0] == observation[key] for key in observation)
+        if terminated:
+            break
+
+
+@pytest.mark.parametrize("plant", PLANTS)
+def test_run_lifetime_matches_steps(plant):
+    model = GrowthModel(plant)
+    curve = model.run_lifetime()
+    model.reset()
+    daily = []
+    for _ in range(model.lifetime):
+        model.step()
+        daily.append(model.biomass)
+    np.testing.assert_allclose(curve, daily, rtol=1e-12)
+
+
+@pytest.mark.parametrize("plant", PLANTS)
+def test_run_segments_matches_daily_conditions(plant):
+    rng = np.random.default_rng(4)
+    model = GrowthModel(plant)
+    starts = np.r_[0, np.sort(rng.choice(np.arange(1, model.lifetime), 6, replace=False))]
+    segments = [(int(start), {name: values[rng.integers(5)] * rng.uniform(0.8, 1.2)
+                              for name, values in model.conditions.items()}) for start in starts]
+    ends, biomass = model.run_segments(segments)
+
+    model.reset()
+    daily = []
+    for day in range(model.lifetime):
+        conditions = segments[np.searchsorted(starts, day, side="right") - 1][1]
+        model.set_conditions({name: [value] * 5 for name, value in conditions.items()})
+        model.step()
+        daily.append(model.biomass)
+    np.testing.assert_allclose(biomass, np.array(daily)[ends - 1], rtol=1e-12)
+
+
+@pytest.mark.parametrize("plant", PLANTS)
+def test_edit_stage_matches_recompute(plant):
+    rng = np.random.default_rng(5)
+    edited = GrowthModel(plant)
+    reference = GrowthModel(plant)
+    names = [name for name in edited.conditions if name != "DLI"]
+    for _ in range(20):
+        stage = int(rng.integers(5))
+        name = names[rng.integers(len(names))]
+        edited.edit_stage(stage, {name: edited.conditions[name][stage] * rng.uniform(0.9, 1.1)})
+        reference.set_conditions(edited.conditions)
+        np.testing.assert_allclose(edited.lifetime_curve(), reference.run_lifetime(), rtol=1e-12)
+
+
+def test_config_cache_follows_the_config(tmp_path):
+    shutil.copy(os.path.join("Config", "Lavender.py"), tmp_path)
+    config = tmp_path / "Lavender.py"
+    assert load_plant_config("Lavender.py", tmp_path).MAX_BIOMASS == 1500
+
+    # Edited, with an mtime the cache has not seen
+    config.write_text(config.read_text().replace("MAX_BIOMASS = 1500", "MAX_BIOMASS = 1525"))
+    os.utime(config, ns=(1, 1))
+    assert load_plant_config("Lavender.py", tmp_path).MAX_BIOMASS == 1525
+
+    # Touched only, the content hash still matches
+    os.utime(config, ns=(2, 2))
+    assert load_plant_config("Lavender.py", tmp_path).MAX_BIOMASS == 1525
+
+    # An unreadable cache is rebuilt
+    (tmp_path / "__plantcache__" / "Lavender.pkl").write_bytes(b"garbage")
+    assert load_plant_config("Lavender.py", tmp_path).MAX_BIOMASS == 1525
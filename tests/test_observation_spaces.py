@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from gym_env import HydroponicEnv
+from observation import OBSERVATION_MODES, unflatten_observation
+from vector_env import HydroponicVectorEnv
+
+
+@pytest.mark.parametrize("observation_mode", OBSERVATION_MODES)
+def test_observations_stay_in_the_declared_space(observation_mode):
+    # A whole default length episode, day runs up to episode_length
+    env = HydroponicEnv(observation_mode=observation_mode)
+    vector = HydroponicVectorEnv(2, observation_mode=observation_mode)
+    env.action_space.seed(0)
+    observation, _ = env.reset(seed=0)
+    vector_observation, _ = vector.reset(seed=0)
+    terminated = False
+    while not terminated:
+        assert env.observation_space.contains(observation)
+        assert vector.observation_space.contains(vector_observation)
+        action = env.action_space.sample()
+        observation, _, terminated, _, _ = env.step(action)
+        vector_observation = vector.step(np.tile(action, (2, 1)))[0]
+    assert env.day == env.episode_length
+
+
+def test_box_round_trip():
+    env = HydroponicEnv(observation_mode="box", episode_length=500)
+    env.reset(seed=0)
+    for _ in range(450):
+        observation = env.step(env.action_space.sample())[0]
+    assert unflatten_observation(observation, "box", env.episode_length) == env.state
@@ -0,0 +1,143 @@
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+import env_plant
+from action_tables import (ACTION_NVEC, EC, LIGHT_DURATION, LIGHT_INTENSITY, PH, RH, TEMP, WATERING_CYCLES,
+                           WATERING_PERIOD, ActionTables, damage_conditions, decode_actions, growth_inputs)
+from damage import DamageEngine
+from observation import flatten_observation, observation_buffer, observation_space
+from plant_profile import PlantProfile, load_plant
+import rollout
+from reward import REWARD, REWARD_FIELDS, compute_reward
+
+
+
+class HydroponicVectorEnv(VectorEnv):
+    metadata = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(self, num_envs, episode_length=1000, lookup_tables=False, observation_mode="dict", plant_config=None,
+                 render_mode=None, action_repeat=1):
+        if render_mode is not None:
+            raise ValueError("HydroponicVectorEnv does not render, use HydroponicEnv for render_mode.")
+        self.num_envs = num_envs
+        self.episode_length = episode_length
+        self.action_repeat = action_repeat
+        self.render_mode = render_mode
+
+        # Same spaces as HydroponicEnv, without building one (no pygame)
+        self.observation_mode = observation_mode
+        self.single_observation_space = observation_space(observation_mode, episode_length)
+        # flat modes write into this reused (N, 10) buffer
+        self.observation_buffer = observation_buffer(observation_mode, (num_envs,))
+        self.single_action_space = spaces.MultiDiscrete(ACTION_NVEC)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        plant = env_plant if plant_config is None else load_plant(plant_config)
+        self.decode = not getattr(plant, "ACTION_INDEX_UNITS", False)
+        self.profile = PlantProfile(plant, horizon=episode_length + 1)
+        self.damage_engine = DamageEngine(self.profile)
+        # Shared by all num_envs plants, a step is one gather of every env's (stage, action) row
+        self.action_tables = ActionTables(self.profile, self.damage_engine, self.decode) if lookup_tables else None
+
+        # Per plant state, one row per sub environment
+        self.day = np.zeros(num_envs, dtype=np.int64)
+        self.current_step = np.zeros(num_envs, dtype=np.int64)
+        self.actions = np.zeros((num_envs, 8), dtype=np.int64)
+        self.reward = np.zeros(num_envs, dtype=np.float64)
+        # (num_envs, REWARD_FIELDS) rows rewritten in place by step(), zero for envs that autoreset this step
+        self.reward_breakdown = np.zeros((num_envs, len(REWARD_FIELDS)), dtype=np.float64)
+        self._autoreset_envs = np.zeros(num_envs, dtype=np.bool_)
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed, options=options)
+        self.day[:] = 0
+        self.current_step[:] = 0
+        self.actions[:] = 0
+        self._autoreset_envs[:] = False
+        return self._get_observation_state(), {}
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs, 8)
+        stepping = ~self._autoreset_envs
+
+        # Sub environments that finished on the last step start a new episode instead of stepping
+        reset_envs = self._autoreset_envs
+        self.day[reset_envs] = 0
+        self.current_step[reset_envs] = 0
+        self.actions[reset_envs] = 0
+
+        self.actions[stepping] = actions[stepping]
+        if self.action_repeat == 1:
+            self.day[stepping] += 1
+            self.current_step[stepping] += 1
+            reward = self.calculate_reward()
+        else:
+            reward = self.calculate_repeat_reward(stepping)
+        self.reward = np.where(stepping, reward, 0.0)
+        self.reward_breakdown[reset_envs] = 0.0
+
+        terminations = stepping & (self.current_step >= self.episode_length)
+        truncations = np.zeros(self.num_envs, dtype=np.bool_)
+        self._autoreset_envs = terminations | truncations
+        # Copied, the buffer is overwritten by the next step
+        infos = {"reward_breakdown": self.reward_breakdown.copy()}
+        return self._get_observation_state(), self.reward, terminations, truncations, infos
+
+    def calculate_repeat_reward(self, stepping):
+        # Every stepping env holds its action for up to action_repeat days, cut at episode_length
+        n_days = np.clip(self.episode_length - self.current_step, 1, self.action_repeat)
+        n_days = np.where(stepping, n_days, 0)
+        days = rollout.hold_action(self.profile, self.damage_engine, self.actions, self.current_step,
+                                   self.action_repeat, self.action_tables, decode=self.decode)
+        held = np.arange(self.action_repeat) < n_days[:, None]
+        reward = np.cumsum(np.where(held, days["reward"], 0.0), axis=1)[:, -1]
+        last = np.maximum(n_days - 1, 0)
+        self.reward_breakdown[:] = days["reward_breakdown"][np.arange(self.num_envs), last]
+        self.day += n_days
+        self.current_step += n_days
+        return reward
+
+    def calculate_stage(self):
+        return self.profile.stage_index[np.minimum(self.day, len(self.profile.stage_index) - 1)]
+
+    def _get_observation_state(self):
+        # Decoded through the same physical units as HydroponicEnv so rounding of ec and ph matches
+        a = self.actions
+        ec = a[:, EC] * 0.1
+        ph = 4.0 + (a[:, PH] * 0.1)
+        observation = {
+            "plant_stage": self.calculate_stage(),
+            "day": self.day.copy(),
+            "watering_cycles": a[:, WATERING_CYCLES].copy(),
+            "watering_period": a[:, WATERING_PERIOD].copy(),
+            "temp": a[:, TEMP].copy(),
+            "RH": a[:, RH].copy(),
+            "light_intensity": a[:, LIGHT_INTENSITY].copy(),
+            "light_duration": a[:, LIGHT_DURATION].copy(),
+            "ec": (ec * 10).astype(np.int64),
+            "ph": ((ph - 4.0) * 10).astype(np.int64),
+        }
+        if self.observation_mode == "dict":
+            return observation
+        return flatten_observation(observation, self.observation_mode, self.observation_buffer, self.episode_length)
+
+    def growth_inputs(self):
+        return growth_inputs(decode_actions(self.actions) if self.decode else self.actions)
+
+    def calculate_RUE(self):
+        return self.profile.rue[self.current_step]
+
+    def damage_conditions(self):
+        return damage_conditions(decode_actions(self.actions) if self.decode else self.actions)
+
+    def calculate_reward(self):
+        if self.action_tables is not None:
+            self.action_tables.compute_reward(self.calculate_stage(), self.calculate_RUE(), self.actions,
+                                              out=self.reward_breakdown)
+            return self.reward_breakdown[:, REWARD]
+        compute_reward(self.profile, self.damage_engine, self.calculate_stage(), self.calculate_RUE(),
+                       self.growth_inputs(), self.damage_conditions(), out=self.reward_breakdown)
+        return self.reward_breakdown[:, REWARD]